@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Config Constants Builder
+
+Freezes the current System/DataSource/Agent configuration into
+src/_config_constants.py as plain literals. When that module exists,
+src.config loads these values instead of parsing environment variables,
+which is useful for container images where the environment is fixed.
+
+Delete the generated file (or call src.config.refresh_env_cache()) to go
+back to reading the environment.
+
+Usage:
+    python build_config_constants.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from src import config
+
+OUTPUT_FILE = project_root / "src" / "_config_constants.py"
+
+
+def build() -> Path:
+    """Write the generated constants module and return its path."""
+    # Always read from the environment, even if an old constants file exists
+    config.refresh_env_cache()
+    
+    system_fields = config.SystemConfig.from_env()._asdict()
+    system_fields["log_level"] = system_fields["log_level"].value
+    
+    lines = [
+        '"""Generated by build_config_constants.py - do not edit."""',
+        "",
+        f"SYSTEM_CONFIG = {system_fields!r}",
+        f"DATA_SOURCE_CONFIG = {config.DataSourceConfig.from_env()._asdict()!r}",
+        f"AGENT_CONFIG = {config.AgentConfig.from_env()._asdict()!r}",
+        "",
+    ]
+    OUTPUT_FILE.write_text("\n".join(lines), encoding="utf-8")
+    return OUTPUT_FILE
+
+
+def main():
+    """Build config constants."""
+    output = build()
+    print(f"✅ Config constants written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,7 @@ from src.agent_tools.data_tools import DataTools  # type: ignore
 from src.agent_tools.email_tools import EmailTools  # type: ignore
 from src.agent_tools.whatsapp_tools import WhatsAppTools  # type: ignore
 from src.agent_tools.drive_tools import DriveTools  # type: ignore
-from src.agent_tools.web_tools import WebTools  # type: ignore
+from src.agent_tools.web_tools import WebTools, create_cached_session  # type: ignore
 from src.agent_tools.refresh_tools import RefreshTools  # type: ignore
 from src.agent_tools.context_tools import ContextTools  # type: ignore
 # L4 removed - using new layer architecture L4
@@ -136,7 +136,10 @@ IMPORTANT: Current time is {current_time}.
         email_tools = EmailTools(self.data_manager)
         whatsapp_tools = WhatsAppTools(self.data_manager)
         brave_api_key = os.getenv("BRAVE_API_KEY")
-        web_tools = WebTools(brave_api_key=brave_api_key)
+        web_tools = WebTools(
+            brave_api_key=brave_api_key,
+            session=create_cached_session(DATA_DIR / "web_cache")
+        )
         refresh_tools = RefreshTools(
             data_manager=self.data_manager,
             email_config=EMAIL_CONFIG,
@@ -28,6 +28,15 @@ DEFAULT_DRIVE_LIMIT = 100
 DEFAULT_DRIVE_SEARCH_LIMIT = 20
 DRIVE_FOLDER_NAME = "Wpmesages"
 
+# Constant error payloads, serialized once at import
+_ERR_CHAT_NAME = json.dumps({"status": "error", "message": "chat_name is required and must be a string"})
+_ERR_QUERY = json.dumps({"status": "error", "message": "query is required and must be a string"})
+_ERR_URL = json.dumps({"status": "error", "message": "url is required and must be a string"})
+_ERR_CONTEXT_ID = json.dumps({"status": "error", "message": "context_id is required and must be a string"})
+_ERR_CONTEXT_IDS = json.dumps({"status": "error", "message": "context_id_1 and context_id_2 are required strings"})
+_ERR_CONTEXT_TYPE_TITLE = json.dumps({"status": "error", "message": "context_type and title are required strings"})
+_ERR_DRIVE_UNAVAILABLE = json.dumps({"status": "error", "message": "Drive tools are not available"})
+
 class ToolExecutor:
     """Executes tools by name and input, handling all tool-related logic."""
 
@@ -82,7 +91,7 @@ class ToolExecutor:
             elif tool_name == "get_whatsapp_messages":
                 chat_name = tool_input.get("chat_name")
                 if not isinstance(chat_name, str):
-                    return json.dumps({"status": "error", "message": "chat_name is required and must be a string"})
+                    return _ERR_CHAT_NAME
                 return self.data_tools.get_whatsapp_messages(
                     chat_name=chat_name,
                     start_date=tool_input.get("start_date"),
@@ -93,7 +102,7 @@ class ToolExecutor:
             elif tool_name == "search_messages":
                 query = tool_input.get("query")
                 if not isinstance(query, str):
-                    return json.dumps({"status": "error", "message": "query is required and must be a string"})
+                    return _ERR_QUERY
                 return self.data_tools.search_messages(
                     query=query,
                     source=tool_input.get("source") or None,
@@ -141,7 +150,7 @@ class ToolExecutor:
             # Drive tools
             elif tool_name == "search_drive_files":
                 if not self.drive_tools:
-                    return json.dumps({"status": "error", "message": "Drive tools are not available"})
+                    return _ERR_DRIVE_UNAVAILABLE
                 query = tool_input.get("query", "")
                 # If query is empty, list all files (replaces list_drive_files)
                 if query:
@@ -159,7 +168,7 @@ class ToolExecutor:
             elif tool_name == "search_web":
                 query = tool_input.get("query")
                 if not isinstance(query, str):
-                    return json.dumps({"status": "error", "message": "query is required and must be a string"})
+                    return _ERR_QUERY
                 return self.web_tools.search_web(
                     query=query,
                     limit=tool_input.get("limit", 5)
@@ -168,7 +177,7 @@ class ToolExecutor:
             elif tool_name == "fetch_webpage":
                 url = tool_input.get("url")
                 if not isinstance(url, str):
-                    return json.dumps({"status": "error", "message": "url is required and must be a string"})
+                    return _ERR_URL
                 return self.web_tools.fetch_webpage(
                     url=url,
                     max_length=tool_input.get("max_length", 5000)
@@ -207,7 +216,7 @@ class ToolExecutor:
                 context_type = tool_input.get("context_type")
                 title = tool_input.get("title")
                 if not isinstance(context_type, str) or not isinstance(title, str):
-                    return json.dumps({"status": "error", "message": "context_type and title are required strings"})
+                    return _ERR_CONTEXT_TYPE_TITLE
                 return self.context_tools.create_context(
                     context_type=context_type,
                     title=title,
@@ -228,7 +237,7 @@ class ToolExecutor:
             elif tool_name == "update_context":
                 context_id = tool_input.get("context_id")
                 if not isinstance(context_id, str):
-                    return json.dumps({"status": "error", "message": "context_id is required and must be a string"})
+                    return _ERR_CONTEXT_ID
                 return self.context_tools.update_context(
                     context_id=context_id,
                     title=tool_input.get("title"),
@@ -249,7 +258,7 @@ class ToolExecutor:
                 context_id_1 = tool_input.get("context_id_1")
                 context_id_2 = tool_input.get("context_id_2")
                 if not isinstance(context_id_1, str) or not isinstance(context_id_2, str):
-                    return json.dumps({"status": "error", "message": "context_id_1 and context_id_2 are required strings"})
+                    return _ERR_CONTEXT_IDS
                 return self.context_tools.link_contexts(
                     context_id_1=context_id_1,
                     context_id_2=context_id_2,
@@ -260,7 +269,7 @@ class ToolExecutor:
             elif tool_name == "get_whatsapp_participants":
                 chat_name = tool_input.get("chat_name")
                 if not isinstance(chat_name, str):
-                    return json.dumps({"status": "error", "message": "chat_name is required and must be a string"})
+                    return _ERR_CHAT_NAME
                 return self.whatsapp_tools.get_chat_participants(
                     chat_name=chat_name
                 )
@@ -268,7 +277,7 @@ class ToolExecutor:
             elif tool_name == "get_whatsapp_chronology":
                 chat_name = tool_input.get("chat_name")
                 if not isinstance(chat_name, str):
-                    return json.dumps({"status": "error", "message": "chat_name is required and must be a string"})
+                    return _ERR_CHAT_NAME
                 return self.whatsapp_tools.get_chat_chronology(
                     chat_name=chat_name,
                     start_date=tool_input.get("start_date"),
@@ -279,7 +288,7 @@ class ToolExecutor:
             elif tool_name == "get_whatsapp_media_references":
                 chat_name = tool_input.get("chat_name")
                 if not isinstance(chat_name, str):
-                    return json.dumps({"status": "error", "message": "chat_name is required and must be a string"})
+                    return _ERR_CHAT_NAME
                 return self.whatsapp_tools.get_media_references(
                     chat_name=chat_name,
                     media_type=tool_input.get("media_type")
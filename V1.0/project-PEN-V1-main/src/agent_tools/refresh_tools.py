@@ -14,6 +14,16 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Sabit hata yanıtları (import sırasında bir kez serialize edilir)
+_ERR_EMAIL_CONNECT = json.dumps({
+    "status": "error",
+    "message": "Email sunucusuna bağlanılamadı"
+})
+_ERR_NO_SERVICE_ACCOUNT = json.dumps({
+    "status": "error",
+    "message": "Service account dosyası yapılandırılmamış"
+})
+
 
 class RefreshTools:
     """Agent için veri güncelleme araçları"""
@@ -58,10 +68,7 @@ class RefreshTools:
             
             # Bağlan
             if not parser.connect():
-                return json.dumps({
-                    "status": "error",
-                    "message": "Email sunucusuna bağlanılamadı"
-                })
+                return _ERR_EMAIL_CONNECT
             
             try:
                 # Mevcut email anahtarlarını yükle (id veya timestamp+subject fallback)
@@ -164,10 +171,7 @@ class RefreshTools:
         """
         try:
             if not self.service_account_file:
-                return json.dumps({
-                    "status": "error",
-                    "message": "Service account dosyası yapılandırılmamış"
-                })
+                return _ERR_NO_SERVICE_ACCOUNT
             
             logger.info(f"Agent: Drive dosyaları güncelleniyor ({folder_name})")
             
@@ -4,6 +4,7 @@ Agent için web search ve scraping tool'ları
 
 import json
 import requests
+from pathlib import Path
 from typing import Optional, Dict, List
 from datetime import datetime
 
@@ -11,19 +12,59 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Cache'e yazılmayan (redact edilen) header/parametreler: requests-cache
+# varsayılanları + Brave Search API key header'ı
+_CACHE_IGNORED_PARAMS = (
+    "Authorization", "X-API-KEY", "access_token", "api_key",
+    "X-Subscription-Token",
+)
+
+
+def create_cached_session(cache_dir: Path, expire_after: int = 3600) -> requests.Session:
+    """
+    ETag/Last-Modified destekli HTTP cache'li session oluştur
+    
+    Aynı sayfa tekrar istendiğinde koşullu GET (If-None-Match /
+    If-Modified-Since) yapılır; 304 dönerse içerik diskten okunur.
+    requests-cache kurulu değilse normal Session döner.
+    
+    Args:
+        cache_dir: SQLite cache dosyasının dizini
+        expire_after: Cache geçerlilik süresi (saniye)
+    
+    Returns:
+        requests.Session (veya requests_cache.CachedSession)
+    """
+    try:
+        import requests_cache
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return requests_cache.CachedSession(
+            str(cache_dir / "http_cache"),
+            backend="sqlite",
+            expire_after=expire_after,
+            cache_control=True,
+            allowable_methods=("GET",),
+            ignored_parameters=_CACHE_IGNORED_PARAMS
+        )
+    except ImportError:
+        logger.warning("requests-cache not installed. Install with: pip install requests-cache")
+        return requests.Session()
+
 
 class WebTools:
     """Agent için web araçları"""
     
-    def __init__(self, brave_api_key: Optional[str] = None):
+    def __init__(self, brave_api_key: Optional[str] = None,
+                 session: Optional[requests.Session] = None):
         """
         WebTools başlat
         
         Args:
             brave_api_key: Brave Search API key (opsiyonel)
+            session: Paylaşılan HTTP session (opsiyonel, örn: create_cached_session())
         """
         self.brave_api_key = brave_api_key
-        self.session = requests.Session()
+        self.session = session if session is not None else requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
@@ -6,16 +6,86 @@ environment variables are properly typed and validated.
 """
 
 import os
+import sys
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 from .enums import LogLevel
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Snapshot of os.environ taken once; from_env() reads from this plain dict
+_ENV: Dict[str, str] = dict(os.environ)
+
+
+def _env_snapshot() -> Dict[str, str]:
+    """Return the cached environment snapshot."""
+    return _ENV
+
+
+# Optional build-time constants (see build_config_constants.py). When present,
+# System/DataSource/Agent config are loaded from literals instead of the env.
+try:
+    from . import _config_constants as _STATIC
+except ImportError:
+    _STATIC = None
+else:
+    logger.warning(
+        "Using frozen config constants from src/_config_constants.py; "
+        "System/DataSource/Agent environment variables are ignored "
+        "(delete the file or call refresh_env_cache() to read the environment)"
+    )
+
+
+def refresh_env_cache() -> None:
+    """Re-snapshot os.environ (call after modifying the environment at runtime)."""
+    global _ENV, _STATIC
+    _ENV = dict(os.environ)
+    # An explicit refresh means "read the environment", not the frozen constants
+    _STATIC = None
+    # Drop lazily built singletons so they pick up the new snapshot
+    for config_cls in (SystemConfig, DataSourceConfig, AgentConfig):
+        config_cls.from_env.cache_clear()
+    _data_sources_dict.cache_clear()
+
+
+_TRUTHY = frozenset({"true", "True", "TRUE", "1", "yes", "YES"})
+
+
+def _to_bool(value: Optional[str], default: bool = False) -> bool:
+    """Parse a boolean environment value without allocating a lowered copy."""
+    return (value in _TRUTHY) if value is not None else default
+
+
+_LOG_LEVEL_MAP: Dict[str, LogLevel] = {level.value: level for level in LogLevel}
+
+# Interned environment variable keys used by the from_env() loaders
+_K: Dict[str, str] = {
+    key: sys.intern(key) for key in (
+        "DEBUG", "LOG_LEVEL", "MAX_WORKERS", "BATCH_SIZE",
+        "WHATSAPP_ENABLED", "EMAIL_ENABLED", "CALENDAR_ENABLED",
+        "DEFAULT_SEARCH_LIMIT", "DEFAULT_RECENT_DAYS", "DEFAULT_RECENT_LIMIT",
+        "DEFAULT_DRIVE_LIMIT", "DEFAULT_DRIVE_SEARCH_LIMIT",
+        "CONTEXT_WINDOW_SIZE", "READING_AGENT_THRESHOLD",
+    )
+}
+
+
+def _load_ints(env: Mapping[str, str], fields: Tuple[Tuple[str, str, int], ...]) -> Dict[str, int]:
+    """Load (field, ENV_KEY, default) integer fields; int() only runs on values actually set."""
+    return {
+        field: int(env[key]) if key in env else default
+        for field, key, default in fields
+    }
+
 
 # ============================================================================
 # Directory Configuration
@@ -75,10 +145,11 @@ class EmailConfig:
     imap_port: int
     
     @classmethod
+    @functools.cache
     def from_env(cls) -> "EmailConfig":
-        """Create configuration from environment variables."""
+        """Create configuration from environment variables (cached)."""
         return cls(
-            enabled=os.getenv("EMAIL_ENABLED", "false").lower() == "true",
+            enabled=_to_bool(os.getenv("EMAIL_ENABLED"), False),
             address=os.getenv("EMAIL_ADDRESS"),
             password=os.getenv("EMAIL_PASSWORD"),
             imap_server=os.getenv("IMAP_SERVER", "imap.gmail.com"),
@@ -88,17 +159,23 @@ class EmailConfig:
     def is_configured(self) -> bool:
         """Check if email is properly configured."""
         return bool(self.address and self.password)
+    
+    @classmethod
+    def reload(cls) -> "EmailConfig":
+        """Drop the cached configuration and re-read environment variables."""
+        cls.from_env.cache_clear()
+        return cls.from_env()
 
 
-EMAIL_CONFIG_OBJ = EmailConfig.from_env()
-# Backward compatibility
-EMAIL_ENABLED = EMAIL_CONFIG_OBJ.enabled
-EMAIL_CONFIG = {
-    "address": EMAIL_CONFIG_OBJ.address,
-    "password": EMAIL_CONFIG_OBJ.password,
-    "imap_server": EMAIL_CONFIG_OBJ.imap_server,
-    "imap_port": EMAIL_CONFIG_OBJ.imap_port
-}
+def _email_config_dict() -> Dict[str, Any]:
+    """Legacy EMAIL_CONFIG dict built from the current EmailConfig."""
+    email_config = EmailConfig.from_env()
+    return {
+        "address": email_config.address,
+        "password": email_config.password,
+        "imap_server": email_config.imap_server,
+        "imap_port": email_config.imap_port
+    }
 
 
 # ============================================================================
@@ -116,8 +193,9 @@ class LLMConfig:
     temperature: float
     
     @classmethod
+    @functools.cache
     def from_env(cls) -> "LLMConfig":
-        """Create configuration from environment variables."""
+        """Create configuration from environment variables (cached)."""
         return cls(
             gemini_api_key=os.getenv("GEMINI_API_KEY"),
             minimax_api_key=os.getenv("MINIMAX_API_KEY"),
@@ -126,23 +204,28 @@ class LLMConfig:
             max_tokens=int(os.getenv("MAX_TOKENS", "24576")),
             temperature=float(os.getenv("TEMPERATURE", "0.7"))
         )
+    
+    @classmethod
+    def reload(cls) -> "LLMConfig":
+        """Drop the cached configuration and re-read environment variables."""
+        cls.from_env.cache_clear()
+        return cls.from_env()
 
 
-LLM_CONFIG_OBJ = LLMConfig.from_env()
-# Backward compatibility
-GEMINI_API_KEY = LLM_CONFIG_OBJ.gemini_api_key
-LLM_CONFIG = {
-    "api_key": LLM_CONFIG_OBJ.openai_api_key,
-    "model": LLM_CONFIG_OBJ.default_model
-}
+def _llm_config_dict() -> Dict[str, Any]:
+    """Legacy LLM_CONFIG dict built from the current LLMConfig."""
+    llm_config = LLMConfig.from_env()
+    return {
+        "api_key": llm_config.openai_api_key,
+        "model": llm_config.default_model
+    }
 
 
 # ============================================================================
 # System Configuration
 # ============================================================================
 
-@dataclass(frozen=True)
-class SystemConfig:
+class SystemConfig(NamedTuple):
     """System-level configuration settings."""
     debug: bool
     log_level: LogLevel
@@ -150,66 +233,78 @@ class SystemConfig:
     batch_size: int
     
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls) -> "SystemConfig":
-        """Create configuration from environment variables."""
-        log_level_str = os.getenv("LOG_LEVEL", "INFO").upper()
-        try:
-            log_level = LogLevel(log_level_str)
-        except ValueError:
-            log_level = LogLevel.INFO
+        """Create configuration from environment variables (cached)."""
+        if _STATIC is not None:
+            fields = dict(_STATIC.SYSTEM_CONFIG)
+            fields["log_level"] = _LOG_LEVEL_MAP.get(fields["log_level"], LogLevel.INFO)
+            return cls(**fields)
+        
+        env = _env_snapshot()
+        log_level = _LOG_LEVEL_MAP.get(env.get(_K["LOG_LEVEL"], "INFO").upper(), LogLevel.INFO)
         
         return cls(
-            debug=os.getenv("DEBUG", "false").lower() == "true",
+            debug=_to_bool(env.get(_K["DEBUG"]), False),
             log_level=log_level,
-            max_workers=int(os.getenv("MAX_WORKERS", "5")),
-            batch_size=int(os.getenv("BATCH_SIZE", "100"))
+            max_workers=int(env.get(_K["MAX_WORKERS"], "5")),
+            batch_size=int(env.get(_K["BATCH_SIZE"], "100"))
         )
 
 
-SYSTEM_CONFIG = SystemConfig.from_env()
-# Backward compatibility
-DEBUG = SYSTEM_CONFIG.debug
-LOG_LEVEL = SYSTEM_CONFIG.log_level.value
-MAX_WORKERS = SYSTEM_CONFIG.max_workers
-BATCH_SIZE = SYSTEM_CONFIG.batch_size
-
-
 # ============================================================================
 # Data Source Configuration
 # ============================================================================
 
-@dataclass(frozen=True)
-class DataSourceConfig:
+class DataSourceConfig(NamedTuple):
     """Configuration for enabled data sources."""
     whatsapp_enabled: bool
     email_enabled: bool
     calendar_enabled: bool
     
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls) -> "DataSourceConfig":
-        """Create configuration from environment variables."""
+        """Create configuration from environment variables (cached)."""
+        if _STATIC is not None:
+            return cls(**_STATIC.DATA_SOURCE_CONFIG)
+        
+        env = _env_snapshot()
         return cls(
-            whatsapp_enabled=os.getenv("WHATSAPP_ENABLED", "true").lower() == "true",
-            email_enabled=os.getenv("EMAIL_ENABLED", "true").lower() == "true",
-            calendar_enabled=os.getenv("CALENDAR_ENABLED", "false").lower() == "true"
+            whatsapp_enabled=_to_bool(env.get(_K["WHATSAPP_ENABLED"]), True),
+            email_enabled=_to_bool(env.get(_K["EMAIL_ENABLED"]), True),
+            calendar_enabled=_to_bool(env.get(_K["CALENDAR_ENABLED"]), False)
         )
 
 
-DATA_SOURCE_CONFIG = DataSourceConfig.from_env()
-# Backward compatibility
-DATA_SOURCES = {
-    "whatsapp": DATA_SOURCE_CONFIG.whatsapp_enabled,
-    "email": DATA_SOURCE_CONFIG.email_enabled,
-    "calendar": DATA_SOURCE_CONFIG.calendar_enabled
-}
+@functools.lru_cache(maxsize=1)
+def _data_sources_dict() -> Mapping[str, bool]:
+    """Read-only {source: enabled} view of DataSourceConfig, built on first use."""
+    data_source_config = DataSourceConfig.from_env()
+    return MappingProxyType({
+        "whatsapp": data_source_config.whatsapp_enabled,
+        "email": data_source_config.email_enabled,
+        "calendar": data_source_config.calendar_enabled
+    })
 
 
 # ============================================================================
 # Agent Configuration
 # ============================================================================
 
-@dataclass(frozen=True)
-class AgentConfig:
+# (field, environment variable, default)
+_AGENT_INT_FIELDS: Tuple[Tuple[str, str, int], ...] = (
+    ("default_search_limit", _K["DEFAULT_SEARCH_LIMIT"], 50),
+    ("default_recent_days", _K["DEFAULT_RECENT_DAYS"], 7),
+    ("default_recent_limit", _K["DEFAULT_RECENT_LIMIT"], 100),
+    ("default_drive_limit", _K["DEFAULT_DRIVE_LIMIT"], 100),
+    ("default_drive_search_limit", _K["DEFAULT_DRIVE_SEARCH_LIMIT"], 20),
+    ("context_window_size", _K["CONTEXT_WINDOW_SIZE"], 1000000),
+    ("reading_agent_threshold", _K["READING_AGENT_THRESHOLD"], 30000),  # 30KB default
+)
+
+
+class AgentConfig(NamedTuple):
     """Agent-specific configuration settings."""
     default_search_limit: int
     default_recent_days: int
@@ -220,17 +315,56 @@ class AgentConfig:
     reading_agent_threshold: int  # Characters, not KB
     
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def from_env(cls) -> "AgentConfig":
-        """Create configuration from environment variables."""
-        return cls(
-            default_search_limit=int(os.getenv("DEFAULT_SEARCH_LIMIT", "50")),
-            default_recent_days=int(os.getenv("DEFAULT_RECENT_DAYS", "7")),
-            default_recent_limit=int(os.getenv("DEFAULT_RECENT_LIMIT", "100")),
-            default_drive_limit=int(os.getenv("DEFAULT_DRIVE_LIMIT", "100")),
-            default_drive_search_limit=int(os.getenv("DEFAULT_DRIVE_SEARCH_LIMIT", "20")),
-            context_window_size=int(os.getenv("CONTEXT_WINDOW_SIZE", "1000000")),
-            reading_agent_threshold=int(os.getenv("READING_AGENT_THRESHOLD", "30000"))  # 30KB default
-        )
+        """Create configuration from environment variables (cached)."""
+        if _STATIC is not None:
+            return cls(**_STATIC.AGENT_CONFIG)
+        return cls(**_load_ints(_env_snapshot(), _AGENT_INT_FIELDS))
 
 
-AGENT_CONFIG = AgentConfig.from_env()
+# ============================================================================
+# Lazy Configuration Access
+# ============================================================================
+
+def __getattr__(name: str):
+    """
+    Build SYSTEM_CONFIG / DATA_SOURCE_CONFIG / AGENT_CONFIG on first access.
+    
+    Importing this module no longer pays for these from_env() calls;
+    consumers that never touch them never build them. The email and LLM
+    names are served here too, so they follow EmailConfig.reload() /
+    LLMConfig.reload() instead of staying bound to the import-time instance.
+    """
+    if name == "SYSTEM_CONFIG":
+        return SystemConfig.from_env()
+    if name == "DATA_SOURCE_CONFIG":
+        return DataSourceConfig.from_env()
+    if name == "AGENT_CONFIG":
+        return AgentConfig.from_env()
+    if name == "EMAIL_CONFIG_OBJ":
+        return EmailConfig.from_env()
+    if name == "LLM_CONFIG_OBJ":
+        return LLMConfig.from_env()
+    
+    # Backward compatibility
+    if name == "DEBUG":
+        return SystemConfig.from_env().debug
+    if name == "LOG_LEVEL":
+        return SystemConfig.from_env().log_level.value
+    if name == "MAX_WORKERS":
+        return SystemConfig.from_env().max_workers
+    if name == "BATCH_SIZE":
+        return SystemConfig.from_env().batch_size
+    if name == "DATA_SOURCES":
+        return _data_sources_dict()
+    if name == "EMAIL_ENABLED":
+        return EmailConfig.from_env().enabled
+    if name == "EMAIL_CONFIG":
+        return _email_config_dict()
+    if name == "GEMINI_API_KEY":
+        return LLMConfig.from_env().gemini_api_key
+    if name == "LLM_CONFIG":
+        return _llm_config_dict()
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
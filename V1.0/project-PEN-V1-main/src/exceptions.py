@@ -3,59 +3,36 @@ Custom exceptions for the PEN project.
 
 This module defines all custom exception types used throughout the project
 for better error handling and debugging.
+
+Leaf exceptions carry no behavior of their own, so they are generated from
+the (name, base, docstring) table below instead of individual class bodies.
 """
 
 
 class PENException(Exception):
     """Base exception for all PEN-related errors."""
-    pass
-
-
-class ConfigurationError(PENException):
-    """Raised when configuration is invalid or missing."""
-    pass
-
-
-class DataManagerError(PENException):
-    """Raised when data management operations fail."""
-    pass
-
-
-class ParserError(PENException):
-    """Raised when parsing operations fail."""
-    pass
-
-
-class WhatsAppParserError(ParserError):
-    """Raised when WhatsApp message parsing fails."""
-    pass
-
-
-class EmailParserError(ParserError):
-    """Raised when email parsing fails."""
-    pass
-
-
-class DriveError(PENException):
-    """Raised when Google Drive operations fail."""
-    pass
-
-
-class MemoryError(PENException):
-    """Raised when L4 memory operations fail."""
-    pass
-
-
-class ToolExecutionError(PENException):
-    """Raised when agent tool execution fails."""
-    pass
-
-
-class APIError(PENException):
-    """Raised when external API calls fail."""
-    pass
-
-
-class ValidationError(PENException):
-    """Raised when data validation fails."""
-    pass
+    __slots__ = ()
+
+
+# (name, base, docstring) - bases must appear before their subclasses
+_LEAF_EXCEPTIONS = (
+    ("ConfigurationError", "PENException", "Raised when configuration is invalid or missing."),
+    ("DataManagerError", "PENException", "Raised when data management operations fail."),
+    ("ParserError", "PENException", "Raised when parsing operations fail."),
+    ("WhatsAppParserError", "ParserError", "Raised when WhatsApp message parsing fails."),
+    ("EmailParserError", "ParserError", "Raised when email parsing fails."),
+    ("DriveError", "PENException", "Raised when Google Drive operations fail."),
+    ("L4MemoryError", "PENException", "Raised when L4 memory operations fail."),
+    ("ToolExecutionError", "PENException", "Raised when agent tool execution fails."),
+    ("APIError", "PENException", "Raised when external API calls fail."),
+    ("ValidationError", "PENException", "Raised when data validation fails."),
+)
+
+for _name, _base, _doc in _LEAF_EXCEPTIONS:
+    globals()[_name] = type(
+        _name,
+        (globals()[_base],),
+        {"__doc__": _doc, "__module__": __name__, "__slots__": ()}
+    )
+
+del _name, _base, _doc
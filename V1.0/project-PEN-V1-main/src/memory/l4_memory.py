@@ -5,14 +5,218 @@ Minimax ile doldurulur, Gemini'ye verilir
 
 import json
 import os
+import functools
+import hashlib
+import bisect
+import heapq
+import operator
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
 
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# WAL'a yazan birden fazla instance/process için dosya kilidi (Windows'ta yok:
+# orada tek process varsayılır)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Hızlı JSON (orjson varsa), yoksa stdlib json
+try:
+    import orjson
+    
+    def _loads(data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def _dumps(obj: Any, pretty: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        return json.loads(data)
+    
+    def _dumps(obj: Any, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# Gemini'ye verilen L4 context'inin üst sınırı (byte)
+MAX_GEMINI_BYTES = 25_000
+
+# Gemini context'inde sıralama için öncelik puanları
+_PRIORITY_SCORES = {"high": 2, "medium": 1, "low": 0}
+
+# _now_iso() bu süre (ns) içinde aynı zaman damgasını döndürür
+NOW_ISO_QUANTUM_NS = 1_000_000
+
+# extract_info_with_minimax sonuç cache'inin boyutu (aynı task + metin tekrar sorulmaz)
+EXTRACT_CACHE_SIZE = 64
+
+# LLM yanıtındaki ilk JSON nesnesini (öncesi/sonrası metinle birlikte) tek geçişte parse eder
+_JSON_DECODER = json.JSONDecoder()
+
+# Profil güncelleme görevinin sabit kısmı; değişken kısım (mevcut profil) sona eklenir
+# ki istek başındaki uzun ön ek API tarafında prompt cache'ten okunabilsin
+_PROFILE_UPDATE_INSTRUCTIONS = """You are updating a user profile based on conversation.
+
+TASK:
+Extract NEW information from the conversation and update ONLY the relevant fields.
+- Use the EXACT field structure from current profile
+- Update "basic" fields: name, age, occupation, location
+- Add to lists (expertise, interests) without duplicating
+- Create new contexts for important events/projects
+
+Return JSON format:
+{
+  "user_profile_updates": {
+    "basic.name": "...",
+    "basic.age": 16,
+    "basic.occupation": "...",
+    "expertise": ["skill1", "skill2"],
+    "interests": ["interest1"]
+  },
+  "new_contexts": [
+    {"type": "project", "title": "...", "data": {...}}
+  ],
+  "action_items": ["..."]
+}
+
+IMPORTANT:
+- Only include fields that have NEW information
+- Use dot notation for nested fields (e.g., "basic.name")
+- Don't duplicate existing information
+
+CURRENT USER PROFILE:
+"""
+
+# WAL bu boyutu geçince değişen shard'lar diske yazılır ve WAL sıfırlanır (compaction)
+WAL_MIN_COMPACT_BYTES = 64 * 1024
+
+# Bellek dizinindeki bölüm dosyaları: {bölüm}.json -> bellekteki path'i
+# (context'ler ayrıca contexts/{YYYYMM}/{context_id}.json olarak tutulur)
+_SECTIONS = {
+    "user_profile": ("user_profile",),
+    "metadata": ("metadata",),
+    "agent_notes": ("memory", "agent_notes"),
+    "insights": ("memory", "insights"),
+}
+_CONTEXT_SHARD_PREFIX = "contexts/"
+
+
+def _apply_op(root: Dict[str, Any], op: Dict[str, Any]):
+    """
+    WAL kaydını bellek dict'ine uygula
+    
+    Desteklenen işlemler:
+        {"op": "set", "path": [...], "value": ...}     -> path'e değer ata (ara dict'ler oluşturulur;
+                                                          son anahtar liste uzunluğuna eşit index ise eklenir)
+        {"op": "append", "path": [...], "value": ...}  -> path'teki listeye ekle (idempotent değil,
+                                                          sadece eski WAL'lar için)
+    """
+    path = op["path"]
+    current = root
+    
+    if op["op"] == "set":
+        for key in path[:-1]:
+            current = current[key] if isinstance(current, list) else current.setdefault(key, {})
+        if isinstance(current, list) and path[-1] == len(current):
+            current.append(op["value"])
+        else:
+            current[path[-1]] = op["value"]
+    elif op["op"] == "append":
+        for key in path:
+            current = current[key]
+        current.append(op["value"])
+    else:
+        raise ValueError(f"Unknown WAL op: {op['op']}")
+
+
+def _write_file_atomic(path: Path, data: bytes, durable: bool = False):
+    """
+    Dosyayı atomik yaz: geçici dosyaya yaz, sonra os.replace ile yerine koy
+    
+    Yazma sırasında crash olursa eski dosya bozulmadan kalır.
+    
+    Args:
+        path: Hedef dosya
+        data: İçerik
+        durable: True ise os.replace öncesi fsync yapılır (kritik veriler için)
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_profile_setter(field_path: str) -> Tuple[Tuple[str, ...], Callable[[Dict[str, Any], Any], None]]:
+    """
+    Nokta ile ayrılmış profil path'i için setter derle (path başına bir kez)
+    
+    Returns:
+        (WAL path'i, setter(profile, value)) - eksik ara dict'ler oluşturulur
+    """
+    parts = field_path.split('.')
+    parents, leaf = parts[:-1], parts[-1]
+    
+    def setter(profile: Dict[str, Any], value: Any):
+        current = profile
+        for part in parents:
+            current = current.setdefault(part, {})
+        current[leaf] = value
+    
+    return ("user_profile", *parts), setter
+
+
+def _op_shard(path: List[Any]) -> str:
+    """WAL kaydının değiştirdiği shard (bölüm adı veya contexts/{context_id})"""
+    if path[0] == "memory":
+        if path[1] == "contexts":
+            return _CONTEXT_SHARD_PREFIX + path[2]
+        return path[1]
+    return path[0]
+
+
+def _context_month(context_id: str) -> str:
+    """Context ID'sinden shard klasörü (YYYYMM); tarih önekli değilse 'misc'"""
+    prefix = context_id[:6]
+    return prefix if prefix.isdigit() and len(prefix) == 6 else "misc"
+
+
+def _build_search_blob(context: Dict[str, Any]) -> str:
+    """Context'in aranabilir metni (title, description, notes, tags) - küçük harfli"""
+    tags = " ".join(str(tag) for tag in context.get("tags") or [])
+    return f"{context.get('title', '')} {context.get('description', '')} {context.get('notes', '')} {tags}".lower()
+
+
+def _index_key(value: Any) -> Any:
+    """Index anahtarı: hashlenemeyen değerler (liste, dict) metne çevrilir"""
+    try:
+        hash(value)
+    except TypeError:
+        return str(value)
+    return value
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Metindeki tüm 3 karakterlik parçalar"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 
 class L4MemorySystem:
     """
@@ -36,12 +240,65 @@ class L4MemorySystem:
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Tek JSON dosya
-        self.memory_file = data_dir / "L4_memory.json"
+        # Shard'lı bellek dizini (bölüm dosyaları + context başına bir dosya)
+        # + append-only değişiklik kaydı (WAL)
+        self.memory_dir = data_dir / "L4_memory"
+        self.contexts_dir = self.memory_dir / "contexts"
+        self.legacy_memory_file = data_dir / "L4_memory.json"
+        self.wal_file = data_dir / "L4_memory.wal.jsonl"
+        
+        # Parse edilmiş bellek cache'i (shard'lar değişmedikçe yeniden okunmaz)
+        self._memory: Optional[Dict[str, Any]] = None
+        self._shard_mtimes: Dict[str, int] = {}  # shard -> son okunan/yazılan mtime
+        self._month_mtimes: Dict[str, int] = {}  # contexts/{YYYYMM} klasörü -> mtime
+        
+        # WAL: her değişiklik tek satır olarak eklenir, sadece değişen shard'lar periyodik yazılır
+        self._wal = open(self.wal_file, 'ab', buffering=0)
+        self._wal_bytes = self.wal_file.stat().st_size
+        self._dirty_shards: Set[str] = set()
+        
+        # WAL'ın bu instance'ın uyguladığı kısmı: başka instance'ların eklediği
+        # kayıtlar _wal_pos'tan sonra okunur. İlk satır (compaction sonrası
+        # rastgele epoch kaydı) değiştiyse WAL başka biri tarafından sıfırlanmıştır
+        self._wal_pos = 0
+        self._wal_head = b""
+        self._wal_seen: Optional[Tuple[int, int, int]] = None  # (inode, boyut, mtime)
+        
+        # Kritik değişiklikler (profil, yeni context) WAL'a fsync ile yazılır;
+        # last_updated gibi defter tutma güncellemeleri fsync beklemez
+        self._critical_mutation = False
+        
+        # _now_iso() cache'i: (monotonic dilim, ISO string)
+        self._now_tick = -1
+        self._now_cached = ""
+        
+        # Bellek her değiştiğinde artar; türetilmiş cache'ler bu değere göre geçersiz olur
+        self._generation = 0
+        self._gemini_cache: Optional[Tuple[Tuple[int, int], str]] = None
+        self._stats_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        
+        # _mutate() bloğu içindeki WAL kayıtları blok bitince tek seferde yazılır
+        self._batch_depth = 0
+        self._pending_ops: List[Dict[str, Any]] = []
+        
+        # İkincil index'ler (cache ile birlikte kurulur, yazmalarla güncellenir)
+        self._idx_by_type: Dict[Any, Set[str]] = defaultdict(set)
+        self._idx_by_tag: Dict[str, Set[str]] = defaultdict(set)
+        self._idx_by_status: Dict[Any, Set[str]] = defaultdict(set)
+        self._idx_by_priority: Dict[Any, Set[str]] = defaultdict(set)
+        self._idx_by_date: List[Tuple[str, str]] = []  # (date, context_id), sıralı
+        self._idx_undated: Set[str] = set()
+        self._search_blobs: Dict[str, str] = {}  # context_id -> aranabilir metin (küçük harf)
+        self._trigram_idx: Dict[str, Set[str]] = defaultdict(set)  # trigram -> context_id'ler
+        self._related_ids: Dict[str, Set[str]] = {}  # context_id -> bağlı context_id'ler (related_contexts)
+        self._related_data_ids: Dict[str, Dict[str, Set[str]]] = {}  # context_id -> data_type -> data_id'ler
+        self._reminders_by_id: Dict[str, int] = {}  # reminder_id -> liste index'i
+        self._pending_heap: List[Tuple[str, int]] = []  # (due_date, liste index'i), tamamlananlar lazy silinir
         
         # Minimax API (Anthropic SDK ile)
         self.minimax_api_key = minimax_api_key or os.getenv("MINIMAX_API_KEY")
         self.minimax_client = None
+        self._extract_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # hash(task, text) -> sonuç
         
         # Minimax client'ı başlat (gerekirse)
         if self.minimax_api_key:
@@ -61,89 +318,673 @@ class L4MemorySystem:
         self.ensure_memory_file()
     
     def ensure_memory_file(self):
-        """L4_memory.json dosyasını oluştur"""
-        if not self.memory_file.exists():
-            initial_data = {
-                "user_profile": {
-                    "basic": {
-                        "name": "",
-                        "age": None,
-                        "occupation": "",
-                        "location": "",
-                        "timezone": "Europe/Istanbul"
-                    },
-                    "preferences": {
-                        "language": "Turkish",
-                        "communication_style": "",
-                        "work_hours": "",
-                        "interests": []
-                    },
-                    "relationships": {
-                        "contacts": {},
-                        "groups": []
-                    },
-                    "habits": {
-                        "activity_pattern": "",
-                        "peak_hours": [],
-                        "typical_tasks": []
-                    },
-                    "expertise": [],
-                    "current_projects": [],
-                    "important_dates": {
-                        "birthdays": {},
-                        "anniversaries": {},
-                        "deadlines": {}
-                    },
-                    "communication_patterns": {
-                        "response_time": "",
-                        "active_hours": [],
-                        "preferred_channels": []
-                    }
+        """
+        L4 bellek dizinini oluştur
+        
+        Eski tek dosyalı L4_memory.json varsa shard'lara taşınır; eksik
+        bölüm dosyaları başlangıç değerleriyle oluşturulur.
+        """
+        if not self.memory_dir.exists() and self.legacy_memory_file.exists():
+            self._migrate_legacy_file()
+            return
+        
+        self.contexts_dir.mkdir(parents=True, exist_ok=True)
+        
+        initial_data = None
+        created = []
+        for section, keys in _SECTIONS.items():
+            section_file = self.memory_dir / f"{section}.json"
+            if section_file.exists():
+                continue
+            if initial_data is None:
+                initial_data = self._initial_memory()
+            value = initial_data
+            for key in keys:
+                value = value[key]
+            _write_file_atomic(section_file, _dumps(value, pretty=True))
+            created.append(section)
+        
+        if len(created) == len(_SECTIONS):
+            # Eski belleğe ait WAL yeni belleğe uygulanmamalı
+            self._truncate_wal()
+            logger.info("✅ L4 memory created")
+        elif created:
+            logger.warning(f"Missing L4 memory sections recreated: {created}")
+    
+    @staticmethod
+    def _initial_memory() -> Dict[str, Any]:
+        """Boş L4 belleği"""
+        return {
+            "user_profile": {
+                "basic": {
+                    "name": "",
+                    "age": None,
+                    "occupation": "",
+                    "location": "",
+                    "timezone": "Europe/Istanbul"
                 },
-                "memory": {
-                    "contexts": {},
-                    "agent_notes": {
-                        "reminders": [],
-                        "daily_notes": {}
-                    },
-                    "insights": {
-                        "patterns": [],
-                        "observations": [],
-                        "recommendations": []
-                    }
+                "preferences": {
+                    "language": "Turkish",
+                    "communication_style": "",
+                    "work_hours": "",
+                    "interests": []
+                },
+                "relationships": {
+                    "contacts": {},
+                    "groups": []
+                },
+                "habits": {
+                    "activity_pattern": "",
+                    "peak_hours": [],
+                    "typical_tasks": []
+                },
+                "expertise": [],
+                "current_projects": [],
+                "important_dates": {
+                    "birthdays": {},
+                    "anniversaries": {},
+                    "deadlines": {}
+                },
+                "communication_patterns": {
+                    "response_time": "",
+                    "active_hours": [],
+                    "preferred_channels": []
+                }
+            },
+            "memory": {
+                "contexts": {},
+                "agent_notes": {
+                    "reminders": [],
+                    "daily_notes": {}
                 },
-                "metadata": {
-                    "created": datetime.now().isoformat(),
-                    "last_updated": None,
-                    "version": "6.0",
-                    "total_contexts": 0,
-                    "total_reminders": 0
+                "insights": {
+                    "patterns": [],
+                    "observations": [],
+                    "recommendations": []
                 }
+            },
+            "metadata": {
+                "created": datetime.now().isoformat(),
+                "last_updated": None,
+                "version": "6.0",
+                "total_contexts": 0,
+                "total_reminders": 0
             }
-            
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(initial_data, f, ensure_ascii=False, indent=2)
-            
-            logger.info("✅ L4 memory file created")
+        }
+    
+    def _migrate_legacy_file(self):
+        """Tek dosyalı L4_memory.json'ı (+WAL) shard dizinine taşı"""
+        memory = _loads(self.legacy_memory_file.read_bytes())
+        self._replay_wal(memory)
+        
+        self.contexts_dir.mkdir(parents=True, exist_ok=True)
+        self._write_shards(memory, self._all_shards(memory), durable=True)
+        self._truncate_wal()
+        
+        self.legacy_memory_file.rename(self.legacy_memory_file.with_suffix(".json.migrated"))
+        logger.info(f"✅ L4 memory migrated to {self.memory_dir}")
     
     def load_memory(self) -> Dict[str, Any]:
-        """Belleği yükle"""
+        """
+        Belleği yükle
+        
+        Shard'lar son okumadan beri değişmediyse parse edilmiş cache döner;
+        dışarıdan değiştirilen shard'lar (bölüm dosyaları, eklenen/silinen/
+        değiştirilen context dosyaları) yeniden okunur ve WAL'daki ilgili
+        kayıtlar üzerlerine uygulanır.
+        """
         try:
-            with open(self.memory_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            full_load = self._memory is None
+            changed = self._changed_shards(full_load)
+            wal_changed = self._wal_stat() != self._wal_seen
+            if not full_load and not changed and not wal_changed:
+                return self._memory
+            
+            memory = self._initial_memory() if full_load else self._memory
+            if full_load:
+                memory["memory"]["contexts"] = {}
+            self._load_shards(memory, changed)
+            if full_load:
+                self._replay_wal(memory)
+            else:
+                if changed:
+                    self._replay_wal(memory, changed)
+                # Başka instance'ların WAL'a eklediği kayıtlar
+                self._catch_up_wal(memory)
+            self._rebuild_indexes(memory)
+            
+            self._memory = memory
+            self._generation += 1
+            return self._memory
         except Exception as e:
             logger.error(f"Error loading L4 memory: {e}")
+            self._memory = None
             self.ensure_memory_file()
             return self.load_memory()
     
     def save_memory(self, data: Dict[str, Any]):
-        """Belleği kaydet"""
+        """Belleğin tamamını shard'lara yaz ve WAL'ı sıfırla (cache de güncellenir)"""
         try:
-            data["metadata"]["last_updated"] = datetime.now().isoformat()
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with self._wal_locked():
+                # WAL sıfırlanmadan önce diğer instance'ların kayıtları da yazılmalı
+                self._catch_up_wal(data)
+                data["metadata"]["last_updated"] = self._now_iso()
+                self._write_shards(data, self._all_shards(data), durable=True)
+                
+                # Bellekte olmayan context dosyalarını sil (yoksa yeniden yüklenirler)
+                contexts = data["memory"]["contexts"]
+                for shard in [shard for shard in self._shard_mtimes if shard.startswith(_CONTEXT_SHARD_PREFIX)]:
+                    context_id = shard[len(_CONTEXT_SHARD_PREFIX):]
+                    if context_id not in contexts:
+                        self._context_shard_file(context_id).unlink(missing_ok=True)
+                        del self._shard_mtimes[shard]
+                
+                self._truncate_wal()
+            
+            if data is not self._memory:
+                self._rebuild_indexes(data)
+            
+            self._memory = data
+            self._generation += 1
         except Exception as e:
             logger.error(f"Error saving L4 memory: {e}")
+            # Cache diskle tutarsız olabilir, bir sonraki okumada yeniden yükle
+            self._memory = None
+    
+    def close(self):
+        """WAL dosyasını kapat"""
+        if not self._wal.closed:
+            self._wal.close()
+    
+    def _now_iso(self) -> str:
+        """Şu anki zaman (ISO) - aynı NOW_ISO_QUANTUM_NS dilimi içinde yeniden hesaplanmaz"""
+        tick = time.monotonic_ns() // NOW_ISO_QUANTUM_NS
+        if tick != self._now_tick:
+            self._now_tick = tick
+            self._now_cached = datetime.now().isoformat()
+        return self._now_cached
+    
+    # ============================================================================
+    # WRITE-AHEAD LOG
+    # ============================================================================
+    
+    def _append_ops(self, memory: Dict[str, Any], ops: List[Dict[str, Any]]):
+        """
+        Bellekte yapılmış değişiklikleri WAL'a ekle
+        
+        Çağıran taraf değişikliği cache'teki dict'e zaten uygulamıştır; burada
+        sadece değişiklik kaydı tek bir write ile diske eklenir. WAL
+        WAL_MIN_COMPACT_BYTES'ı geçince sadece değişen shard'lar yeniden
+        yazılır ve WAL sıfırlanır (compaction). _mutate() bloğu
+        içinde çağrılırsa kayıtlar biriktirilir ve blok sonunda yazılır.
+        
+        Yazma ve compaction WAL kilidi altında yapılır; önce diğer
+        instance'ların eklediği kayıtlar belleğe alınır ki compaction
+        onları da shard'lara yazsın.
+        
+        Args:
+            memory: Değiştirilmiş bellek (load_memory() sonucu)
+            ops: WAL kayıtları (bkz. _apply_op)
+        """
+        # Bellek çağıran tarafça zaten değiştirildi
+        self._generation += 1
+        
+        if self._batch_depth:
+            self._pending_ops.extend(ops)
+            return
+        
+        try:
+            now = self._now_iso()
+            memory["metadata"]["last_updated"] = now
+            ops = ops + [{"op": "set", "path": ["metadata", "last_updated"], "value": now}]
+            
+            payload = b"".join(_dumps(op) + b"\n" for op in ops)
+            with self._wal_locked():
+                if self._catch_up_wal(memory):
+                    self._rebuild_indexes(memory)
+                
+                self._wal.write(payload)
+                if self._critical_mutation:
+                    os.fsync(self._wal.fileno())
+                    self._critical_mutation = False
+                if not self._wal_pos:
+                    self._wal_head = payload[:payload.index(b"\n") + 1]
+                self._wal_pos = self._wal_bytes = os.fstat(self._wal.fileno()).st_size
+                self._wal_seen = self._wal_stat()
+                self._dirty_shards.update(_op_shard(op["path"]) for op in ops)
+                
+                if self._wal_bytes > WAL_MIN_COMPACT_BYTES:
+                    # WAL sıfırlanmadan önce shard'lar diske kalıcı yazılmalı
+                    self._write_shards(memory, self._dirty_shards, durable=True)
+                    self._truncate_wal()
+        except Exception as e:
+            logger.error(f"Error writing L4 WAL: {e}")
+            self._memory = None
+    
+    @contextmanager
+    def _mutate(self) -> Iterator[Dict[str, Any]]:
+        """
+        Toplu değişiklik bloğu
+        
+        Blok içindeki tüm güncellemeler (update_user_profile, create_context vb.)
+        cache'teki bellek üzerinde yapılır, WAL'a blok sonunda tek write ile
+        eklenir. İç içe kullanılabilir; yazma en dıştaki blok bitince olur.
+        
+        Kullanım:
+            with self._mutate() as memory:
+                ...
+        """
+        memory = self.load_memory()
+        self._batch_depth += 1
+        try:
+            yield memory
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._pending_ops:
+                ops, self._pending_ops = self._pending_ops, []
+                self._append_ops(self._memory if self._memory is not None else memory, ops)
+    
+    def _replay_wal(self, memory: Dict[str, Any], shards: Optional[Set[str]] = None):
+        """
+        WAL kayıtlarını diskten okunan shard'lar üzerine uygula
+        
+        Args:
+            memory: Bellek
+            shards: Sadece bu shard'lara ait kayıtları uygula (None = hepsi;
+                bu durumda okunan konum _wal_pos olarak kaydedilir)
+        """
+        if not self.wal_file.exists():
+            return
+        
+        head, end, seen = self._apply_wal_from(memory, 0, shards)
+        if shards is None:
+            self._wal_head, self._wal_pos, self._wal_seen = head, end, seen
+    
+    def _catch_up_wal(self, memory: Dict[str, Any]) -> bool:
+        """
+        Başka instance'ların _wal_pos'tan sonra WAL'a eklediği kayıtları uygula
+        
+        WAL başka bir instance tarafından sıfırlandıysa (boyut küçüldü veya
+        ilk satır değişti) baştan okunur; o instance'ın compaction'ı kendi
+        bildiklerini shard'lara yazmıştır, değişen shard'lar mtime ile yüklenir.
+        Dosya silinip yeniden oluşturulduysa yazma handle'ı da yeniden açılır.
+        
+        Returns:
+            En az bir kayıt uygulandıysa True
+        """
+        if self._wal_stat() == self._wal_seen:
+            return False
+        
+        if not self.wal_file.exists() or os.stat(self.wal_file).st_ino != os.fstat(self._wal.fileno()).st_ino:
+            self._wal.close()
+            self._wal = open(self.wal_file, 'ab', buffering=0)
+            self._wal_pos, self._wal_head = 0, b""
+        
+        with open(self.wal_file, 'rb') as f:
+            head = f.readline()
+            size = os.fstat(f.fileno()).st_size
+        if size < self._wal_pos or (self._wal_head and head != self._wal_head):
+            self._wal_pos = 0
+        
+        start = self._wal_pos
+        self._wal_head, self._wal_pos, self._wal_seen = self._apply_wal_from(memory, start)
+        self._wal_bytes = size
+        return self._wal_pos > start
+    
+    def _apply_wal_from(self, memory: Dict[str, Any], start: int,
+                        shards: Optional[Set[str]] = None) -> Tuple[bytes, int, Optional[Tuple[int, int, int]]]:
+        """
+        WAL'ı start konumundan itibaren oku ve tamamlanmış satırları uygula
+        
+        Uygulanan kayıtların shard'ları dirty işaretlenir (bir sonraki
+        compaction onları da yazmalı, yoksa WAL sıfırlanınca kaybolurlar).
+        
+        Args:
+            memory: Bellek
+            start: Byte konumu
+            shards: Sadece bu shard'lara ait kayıtları uygula (None = hepsi)
+        
+        Returns:
+            (WAL'ın ilk satırı, okunan son tam satırın bittiği konum,
+            okumadan önceki _wal_stat() - sonraki yazmalar değişim olarak görülsün)
+        """
+        with open(self.wal_file, 'rb') as f:
+            seen = self._wal_stat(f.fileno())
+            head = f.readline()
+            f.seek(start)
+            data = f.read()
+        
+        # Yazılmakta olan (\n ile bitmemiş) son satır bir sonraki okumaya kalır
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                op = _loads(line)
+                if op["op"] == "epoch":
+                    continue
+                shard = _op_shard(op["path"])
+                if shards is None or shard in shards:
+                    _apply_op(memory, op)
+                    self._dirty_shards.add(shard)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                # Yarım yazılmış satır (crash) vb. - atla
+                logger.warning(f"Skipping invalid L4 WAL entry: {e}")
+        
+        return head, start + end, seen
+    
+    def _wal_stat(self, fd: Optional[int] = None) -> Optional[Tuple[int, int, int]]:
+        """WAL dosyasının (inode, boyut, mtime) bilgisi - değişim kontrolü için"""
+        try:
+            st = os.fstat(fd) if fd is not None else os.stat(self.wal_file)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+    
+    @contextmanager
+    def _wal_locked(self) -> Iterator[None]:
+        """WAL üzerinde process'ler arası özel kilit (fcntl yoksa no-op)"""
+        if fcntl is None:
+            yield
+            return
+        fd = self._wal.fileno()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    
+    def _truncate_wal(self):
+        """
+        WAL'ı sıfırla (shard'lar yazıldıktan sonra)
+        
+        Başa rastgele bir epoch kaydı yazılır; diğer instance'lar ilk satırın
+        değiştiğini görüp WAL'ı baştan okumaları gerektiğini anlar.
+        """
+        epoch = _dumps({"op": "epoch", "value": os.urandom(8).hex()}) + b"\n"
+        self._wal.seek(0)
+        self._wal.truncate()
+        self._wal.write(epoch)
+        self._wal_head = epoch
+        self._wal_pos = self._wal_bytes = len(epoch)
+        self._wal_seen = self._wal_stat()
+        self._dirty_shards = set()
+    
+    # ============================================================================
+    # SHARDED STORE
+    # ============================================================================
+    
+    def _context_shard_file(self, context_id: str) -> Path:
+        """Context'in dosyası: contexts/{YYYYMM}/{context_id}.json"""
+        return self.contexts_dir / _context_month(context_id) / f"{quote(context_id, safe='')}.json"
+    
+    def _shard_file(self, shard: str) -> Path:
+        """Shard anahtarının dosyası"""
+        if shard.startswith(_CONTEXT_SHARD_PREFIX):
+            return self._context_shard_file(shard[len(_CONTEXT_SHARD_PREFIX):])
+        return self.memory_dir / f"{shard}.json"
+    
+    @staticmethod
+    def _all_shards(memory: Dict[str, Any]) -> List[str]:
+        """Belleğin tüm shard anahtarları"""
+        return list(_SECTIONS) + [_CONTEXT_SHARD_PREFIX + context_id for context_id in memory["memory"]["contexts"]]
+    
+    def _write_shards(self, memory: Dict[str, Any], shards: Iterable[str], durable: bool = False):
+        """
+        Verilen shard'ları bellekten diske atomik yaz (mtime'lar kaydedilir)
+        
+        Args:
+            memory: Bellek
+            shards: Yazılacak shard anahtarları
+            durable: Her dosyayı fsync ile yaz
+        """
+        month_dirs = set()
+        for shard in shards:
+            if shard.startswith(_CONTEXT_SHARD_PREFIX):
+                value = memory["memory"]["contexts"].get(shard[len(_CONTEXT_SHARD_PREFIX):])
+            else:
+                value = memory
+                for key in _SECTIONS[shard]:
+                    value = value[key]
+            
+            shard_file = self._shard_file(shard)
+            if shard.startswith(_CONTEXT_SHARD_PREFIX):
+                shard_file.parent.mkdir(exist_ok=True)
+                month_dirs.add(shard_file.parent)
+            _write_file_atomic(shard_file, _dumps(value, pretty=True), durable)
+            self._shard_mtimes[shard] = shard_file.stat().st_mtime_ns
+        
+        # Kendi yazdığımız dosyalar dış değişiklik sayılmasın
+        for month_dir in month_dirs:
+            self._month_mtimes[month_dir.name] = month_dir.stat().st_mtime_ns
+    
+    def _changed_shards(self, full_load: bool = False) -> Set[str]:
+        """
+        Son okuma/yazmadan beri diskte değişen shard'lar
+        
+        Bölüm dosyaları tek tek stat edilir; context klasörlerinde sadece
+        mtime'ı değişen (dosya eklenen/silinen/değiştirilen) YYYYMM klasörleri
+        taranır.
+        
+        Args:
+            full_load: Kayıtlı mtime'ları yok say (tüm shard'lar değişmiş sayılır)
+        """
+        if full_load:
+            self._shard_mtimes = {}
+            self._month_mtimes = {}
+        
+        changed = set()
+        for section in _SECTIONS:
+            if self._shard_mtimes.get(section) != (self.memory_dir / f"{section}.json").stat().st_mtime_ns:
+                changed.add(section)
+        
+        seen_months = set()
+        with os.scandir(self.contexts_dir) as month_entries:
+            for month_entry in month_entries:
+                if not month_entry.is_dir():
+                    continue
+                seen_months.add(month_entry.name)
+                month_mtime = month_entry.stat().st_mtime_ns
+                if self._month_mtimes.get(month_entry.name) == month_mtime:
+                    continue
+                self._month_mtimes[month_entry.name] = month_mtime
+                
+                on_disk = set()
+                with os.scandir(month_entry.path) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".json"):
+                            continue
+                        shard = _CONTEXT_SHARD_PREFIX + unquote(entry.name[:-len(".json")])
+                        on_disk.add(shard)
+                        if self._shard_mtimes.get(shard) != entry.stat().st_mtime_ns:
+                            changed.add(shard)
+                
+                # Klasörden silinen context dosyaları
+                changed.update(
+                    shard for shard in self._shard_mtimes
+                    if shard.startswith(_CONTEXT_SHARD_PREFIX)
+                    and _context_month(shard[len(_CONTEXT_SHARD_PREFIX):]) == month_entry.name
+                    and shard not in on_disk
+                )
+        
+        # Tamamen silinen YYYYMM klasörleri
+        for month in set(self._month_mtimes) - seen_months:
+            del self._month_mtimes[month]
+            changed.update(
+                shard for shard in self._shard_mtimes
+                if shard.startswith(_CONTEXT_SHARD_PREFIX)
+                and _context_month(shard[len(_CONTEXT_SHARD_PREFIX):]) == month
+            )
+        
+        return changed
+    
+    def _load_shards(self, memory: Dict[str, Any], shards: Iterable[str]):
+        """Verilen shard'ları diskten belleğe oku (silinmiş context'ler bellekten çıkarılır)"""
+        contexts = memory["memory"]["contexts"]
+        for shard in shards:
+            shard_file = self._shard_file(shard)
+            
+            if shard.startswith(_CONTEXT_SHARD_PREFIX):
+                context_id = shard[len(_CONTEXT_SHARD_PREFIX):]
+                if not shard_file.exists():
+                    contexts.pop(context_id, None)
+                    self._shard_mtimes.pop(shard, None)
+                    continue
+                contexts[context_id] = _loads(shard_file.read_bytes())
+            else:
+                parent = memory
+                keys = _SECTIONS[shard]
+                for key in keys[:-1]:
+                    parent = parent[key]
+                parent[keys[-1]] = _loads(shard_file.read_bytes())
+            
+            self._shard_mtimes[shard] = shard_file.stat().st_mtime_ns
+    
+    # ============================================================================
+    # INDEXES
+    # ============================================================================
+    
+    def _rebuild_indexes(self, memory: Dict[str, Any]):
+        """Tüm ikincil index'leri bellekten yeniden kur"""
+        self._idx_by_type = defaultdict(set)
+        self._idx_by_tag = defaultdict(set)
+        self._idx_by_status = defaultdict(set)
+        self._idx_by_priority = defaultdict(set)
+        self._idx_by_date = []
+        self._idx_undated = set()
+        self._search_blobs = {}
+        self._trigram_idx = defaultdict(set)
+        self._related_ids = {}
+        self._related_data_ids = {}
+        
+        for context_id, context in memory["memory"]["contexts"].items():
+            if context is not None:
+                # Eski context'lerde ID alanı yok (arama sonuçları ID'yi context'ten okur)
+                context.setdefault("context_id", context_id)
+                self._index_context(context_id, context)
+        
+        reminders = memory["memory"]["agent_notes"]["reminders"]
+        self._reminders_by_id = {}
+        for index, reminder in enumerate(reminders):
+            # Aynı ID birden fazla varsa ilk kayıt geçerli
+            self._reminders_by_id.setdefault(reminder.get("id"), index)
+        self._pending_heap = [
+            (reminder.get("due_date") or "", index)
+            for index, reminder in enumerate(reminders)
+            if reminder.get("status") == "pending"
+        ]
+        heapq.heapify(self._pending_heap)
+    
+    def _index_context(self, context_id: str, context: Dict[str, Any]):
+        """Context'i index'lere ekle"""
+        blob = _build_search_blob(context)
+        self._search_blobs[context_id] = blob
+        for gram in _trigrams(blob):
+            self._trigram_idx[gram].add(context_id)
+        self._related_ids[context_id] = {
+            _index_key(link.get("context_id")) for link in context.get("related_contexts") or [] if isinstance(link, dict)
+        }
+        self._related_data_ids[context_id] = {
+            data_type: {_index_key(data_id) for data_id in data_ids}
+            for data_type, data_ids in (context.get("related_data") or {}).items()
+            if isinstance(data_ids, list)
+        }
+        self._idx_by_type[_index_key(context.get("type"))].add(context_id)
+        self._idx_by_status[_index_key(context.get("status"))].add(context_id)
+        self._idx_by_priority[_index_key(context.get("priority"))].add(context_id)
+        for tag in context.get("tags") or []:
+            if isinstance(tag, str):
+                self._idx_by_tag[tag].add(context_id)
+        
+        date = context.get("date")
+        if date and isinstance(date, str):
+            bisect.insort(self._idx_by_date, (date, context_id))
+        else:
+            self._idx_undated.add(context_id)
+    
+    def _unindex_context(self, context_id: str, context: Dict[str, Any]):
+        """Context'i index'lerden çıkar (güncellemeden önce çağrılır)"""
+        blob = self._search_blobs.pop(context_id, "")
+        for gram in _trigrams(blob):
+            postings = self._trigram_idx.get(gram)
+            if postings is not None:
+                postings.discard(context_id)
+                if not postings:
+                    del self._trigram_idx[gram]
+        self._related_ids.pop(context_id, None)
+        self._related_data_ids.pop(context_id, None)
+        self._idx_by_type[_index_key(context.get("type"))].discard(context_id)
+        self._idx_by_status[_index_key(context.get("status"))].discard(context_id)
+        self._idx_by_priority[_index_key(context.get("priority"))].discard(context_id)
+        for tag in context.get("tags") or []:
+            if isinstance(tag, str):
+                self._idx_by_tag[tag].discard(context_id)
+        
+        date = context.get("date")
+        if date and isinstance(date, str):
+            position = bisect.bisect_left(self._idx_by_date, (date, context_id))
+            if position < len(self._idx_by_date) and self._idx_by_date[position] == (date, context_id):
+                del self._idx_by_date[position]
+        else:
+            self._idx_undated.discard(context_id)
+    
+    def _filter_candidates(self, filters: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """
+        Filtrelere uyan context ID'lerini index'lerden bul
+        
+        Returns:
+            Aday ID set'i veya None (index'lenmiş filtre yoksa - tüm context'ler aday)
+        """
+        if not filters:
+            return None
+        
+        candidate_sets = []
+        if "type" in filters:
+            candidate_sets.append(self._idx_by_type.get(_index_key(filters["type"]), set()))
+        if "status" in filters:
+            candidate_sets.append(self._idx_by_status.get(_index_key(filters["status"]), set()))
+        if "priority" in filters:
+            candidate_sets.append(self._idx_by_priority.get(_index_key(filters["priority"]), set()))
+        if "tags" in filters:
+            tagged = set()
+            for tag in filters["tags"]:
+                tagged |= self._idx_by_tag.get(_index_key(tag), set())
+            candidate_sets.append(tagged)
+        if "date_range" in filters:
+            # Tarihi olmayan context'ler tarih filtresinden geçer
+            start = filters["date_range"].get("start")
+            end = filters["date_range"].get("end")
+            low = bisect.bisect_left(self._idx_by_date, (start,)) if start else 0
+            high = bisect.bisect_right(self._idx_by_date, (end, "\uffff")) if end else len(self._idx_by_date)
+            in_range = {context_id for _, context_id in self._idx_by_date[low:high]}
+            candidate_sets.append(in_range | self._idx_undated)
+        
+        if not candidate_sets:
+            return None
+        
+        candidate_sets.sort(key=len)
+        return candidate_sets[0].intersection(*candidate_sets[1:])
+    
+    def _query_candidates(self, query_lower: str) -> Optional[Set[str]]:
+        """
+        Sorgunun tüm trigram'larını içeren context ID'leri (trigram index'ten)
+        
+        Returns:
+            Aday ID set'i veya None (sorgu 3 karakterden kısa - index kullanılamaz)
+        """
+        query_grams = _trigrams(query_lower)
+        if not query_grams:
+            return None
+        
+        postings = []
+        for gram in query_grams:
+            context_ids = self._trigram_idx.get(gram)
+            if not context_ids:
+                return set()
+            postings.append(context_ids)
+        
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
     
     # ============================================================================
     # USER PROFILE
@@ -173,20 +1014,14 @@ class L4MemorySystem:
         try:
             memory = self.load_memory()
             
-            # Path'i parse et
-            parts = field_path.split('.')
-            current = memory["user_profile"]
-            
-            # Son field'e kadar git
-            for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-            
-            # Değeri güncelle
-            current[parts[-1]] = value
+            # Değeri güncelle (path başına derlenmiş setter)
+            wal_path, setter = _compile_profile_setter(field_path)
+            setter(memory["user_profile"], value)
             
-            self.save_memory(memory)
+            self._critical_mutation = True
+            self._append_ops(memory, [
+                {"op": "set", "path": list(wal_path), "value": value}
+            ])
             logger.info(f"✅ User profile updated: {field_path} = {value}")
             return True
             
@@ -231,10 +1066,11 @@ class L4MemorySystem:
             
             # Context oluştur (yeni field'lar ile)
             context = {
+                "context_id": context_id,
                 "type": context_type,
                 "title": title,
-                "created": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
+                "created": self._now_iso(),
+                "last_updated": self._now_iso(),
                 "date": data.get("date"),
                 "time": data.get("time"),
                 "description": data.get("description", ""),
@@ -253,11 +1089,22 @@ class L4MemorySystem:
                 "notes": data.get("notes", "")
             }
             
+            # Önce index'le: hata olursa bellek değişmeden kalır (WAL'a yazılmamış context olmaz)
+            try:
+                self._index_context(context_id, context)
+            except Exception:
+                self._unindex_context(context_id, context)
+                raise
+            
             # Kaydet
             memory["memory"]["contexts"][context_id] = context
             memory["metadata"]["total_contexts"] = len(memory["memory"]["contexts"])
             
-            self.save_memory(memory)
+            self._critical_mutation = True
+            self._append_ops(memory, [
+                {"op": "set", "path": ["memory", "contexts", context_id], "value": context},
+                {"op": "set", "path": ["metadata", "total_contexts"], "value": memory["metadata"]["total_contexts"]}
+            ])
             logger.info(f"✅ Context created: {context_id} - {title}")
             
             return context_id
@@ -283,6 +1130,9 @@ class L4MemorySystem:
         if not context:
             return None
         
+        # Cache'teki nesneyi değiştirmemek için kopya üzerinde çalış
+        context = dict(context)
+        
         # Bağlantılı context'leri de getir
         if include_linked and "related_contexts" in context:
             linked_contexts = []
@@ -320,12 +1170,22 @@ class L4MemorySystem:
                 logger.warning(f"Context not found: {context_id}")
                 return False
             
-            # Güncelle
+            # Güncelle (yeni hali index'lenemezse bellek ve index'ler eski halinde kalır)
             context = memory["memory"]["contexts"][context_id]
-            context.update(updates)
-            context["last_updated"] = datetime.now().isoformat()
+            updated = {**context, **updates, "last_updated": self._now_iso()}
+            self._unindex_context(context_id, context)
+            try:
+                self._index_context(context_id, updated)
+            except Exception:
+                self._unindex_context(context_id, updated)
+                self._index_context(context_id, context)
+                raise
+            context.clear()
+            context.update(updated)
             
-            self.save_memory(memory)
+            self._append_ops(memory, [
+                {"op": "set", "path": ["memory", "contexts", context_id], "value": context}
+            ])
             logger.info(f"✅ Context updated: {context_id}")
             return True
             
@@ -342,55 +1202,31 @@ class L4MemorySystem:
             filters: Filtreler (type, date_range, tags, status, priority, etc.)
         
         Returns:
-            Bulunan context'ler
+            Bulunan context'ler (cache'teki nesneler - kopyalanmaz, değiştirilmemeli)
         """
         memory = self.load_memory()
+        contexts = memory["memory"]["contexts"]
         results = []
         query_lower = query.lower()
         
-        for context_id, context in memory["memory"]["contexts"].items():
+        # Filtreler (type, tags, status, priority, date_range) ve sorgu
+        # trigram'ları index'lerden uygulanır; gerçek substring kontrolü
+        # sadece kalan adaylarda yapılır
+        candidate_ids = self._filter_candidates(filters)
+        query_ids = self._query_candidates(query_lower)
+        if query_ids is not None:
+            candidate_ids = query_ids if candidate_ids is None else candidate_ids & query_ids
+        
+        for context_id in (contexts.keys() if candidate_ids is None else candidate_ids):
+            context = contexts.get(context_id)
+            
             # None context'leri atla
             if context is None:
                 continue
 
-            # String search (genişletilmiş)
-            searchable_text = f"{context.get('title', '')} {context.get('description', '')} {context.get('notes', '')} {' '.join(context.get('tags', []))}"
-            
-            if query_lower in searchable_text.lower():
-                # Filtreler
-                if filters:
-                    # Type filter
-                    if "type" in filters and context.get("type") != filters["type"]:
-                        continue
-                    
-                    # Tags filter
-                    if "tags" in filters:
-                        if not any(tag in context.get("tags", []) for tag in filters["tags"]):
-                            continue
-                    
-                    # Status filter
-                    if "status" in filters and context.get("status") != filters["status"]:
-                        continue
-                    
-                    # Priority filter
-                    if "priority" in filters and context.get("priority") != filters["priority"]:
-                        continue
-                    
-                    # Date range filter
-                    if "date_range" in filters:
-                        ctx_date = context.get("date")
-                        if ctx_date:
-                            start = filters["date_range"].get("start")
-                            end = filters["date_range"].get("end")
-                            if start and ctx_date < start:
-                                continue
-                            if end and ctx_date > end:
-                                continue
-                
-                results.append({
-                    "context_id": context_id,
-                    **context
-                })
+            # String search (title, description, notes, tags - önceden hesaplanmış)
+            if query_lower in self._search_blobs.get(context_id, ""):
+                results.append(context)
         
         # Tarihe göre sırala (yeniden eskiye)
         results.sort(key=lambda x: x.get("created", ""), reverse=True)
@@ -431,10 +1267,12 @@ class L4MemorySystem:
                 "relation": relation_type
             }
             
-            # Duplicate kontrolü
-            if not any(link["context_id"] == context_id_2 for link in context1["related_contexts"]):
+            # Duplicate kontrolü (set üzerinden)
+            related_ids_1 = self._related_ids.setdefault(context_id_1, set())
+            if context_id_2 not in related_ids_1:
                 context1["related_contexts"].append(link_info)
-                context1["last_updated"] = datetime.now().isoformat()
+                related_ids_1.add(context_id_2)
+                context1["last_updated"] = self._now_iso()
             
             # İkinci context'e de birinci context'i ekle (bidirectional)
             context2 = memory["memory"]["contexts"][context_id_2]
@@ -456,11 +1294,16 @@ class L4MemorySystem:
                 "relation": reverse_relation
             }
             
-            if not any(link["context_id"] == context_id_1 for link in context2["related_contexts"]):
+            related_ids_2 = self._related_ids.setdefault(context_id_2, set())
+            if context_id_1 not in related_ids_2:
                 context2["related_contexts"].append(reverse_link_info)
-                context2["last_updated"] = datetime.now().isoformat()
+                related_ids_2.add(context_id_1)
+                context2["last_updated"] = self._now_iso()
             
-            self.save_memory(memory)
+            self._append_ops(memory, [
+                {"op": "set", "path": ["memory", "contexts", context_id_1], "value": context1},
+                {"op": "set", "path": ["memory", "contexts", context_id_2], "value": context2}
+            ])
             logger.info(f"✅ Contexts linked: {context_id_1} <-{relation_type}-> {context_id_2}")
             return True
             
@@ -497,12 +1340,16 @@ class L4MemorySystem:
             if data_type not in context["related_data"]:
                 context["related_data"][data_type] = []
             
-            # Ekle (duplicate kontrolü)
-            if data_id not in context["related_data"][data_type]:
+            # Ekle (duplicate kontrolü set üzerinden)
+            linked_ids = self._related_data_ids.setdefault(context_id, {}).setdefault(data_type, set())
+            if data_id not in linked_ids:
                 context["related_data"][data_type].append(data_id)
-                context["last_updated"] = datetime.now().isoformat()
+                linked_ids.add(data_id)
+                context["last_updated"] = self._now_iso()
                 
-                self.save_memory(memory)
+                self._append_ops(memory, [
+                    {"op": "set", "path": ["memory", "contexts", context_id], "value": context}
+                ])
                 logger.info(f"✅ Data linked to context: {context_id} <- {data_type}:{data_id}")
                 return True
             
@@ -545,14 +1392,21 @@ class L4MemorySystem:
                 "priority": priority,
                 "context_id": context_id,
                 "status": "pending",
-                "created": datetime.now().isoformat()
+                "created": self._now_iso()
             }
             
             # Ekle
             memory["memory"]["agent_notes"]["reminders"].append(reminder)
             memory["metadata"]["total_reminders"] = len(memory["memory"]["agent_notes"]["reminders"])
+            index = len(memory["memory"]["agent_notes"]["reminders"]) - 1
+            self._reminders_by_id.setdefault(reminder_id, index)
+            heapq.heappush(self._pending_heap, (due_date or "", index))
             
-            self.save_memory(memory)
+            self._append_ops(memory, [
+                # Index'e set: shard yazıldıktan sonra WAL tekrar oynatılırsa çift kayıt oluşmaz
+                {"op": "set", "path": ["memory", "agent_notes", "reminders", index], "value": reminder},
+                {"op": "set", "path": ["metadata", "total_reminders"], "value": memory["metadata"]["total_reminders"]}
+            ])
             logger.info(f"✅ Reminder created: {reminder_id} - {title}")
             
             return reminder_id
@@ -561,23 +1415,39 @@ class L4MemorySystem:
             logger.error(f"Error creating reminder: {e}")
             return ""
     
-    def get_pending_reminders(self) -> List[Dict[str, Any]]:
+    def get_pending_reminders(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Bekleyen hatırlatıcıları getir
+        Bekleyen hatırlatıcıları getir (bitiş tarihine göre sıralı)
+        
+        Args:
+            limit: Maksimum hatırlatıcı sayısı (None = hepsi)
         
         Returns:
             Pending reminder'lar
         """
         memory = self.load_memory()
         reminders = memory["memory"]["agent_notes"]["reminders"]
+        heap = self._pending_heap
+        
+        def is_pending(entry: Tuple[str, int]) -> bool:
+            return reminders[entry[1]].get("status") == "pending"
         
-        # Sadece pending olanlar
-        pending = [r for r in reminders if r.get("status") == "pending"]
+        if limit is None:
+            # Tamamlanmış kayıtları heap'ten temizle
+            live = sorted(filter(is_pending, heap))
+            self._pending_heap = live  # sıralı liste geçerli bir heap'tir
+            return [reminders[index] for _, index in live]
         
-        # Tarihe göre sırala
-        pending.sort(key=lambda x: x.get("due_date", ""))
+        # İlk `limit` canlı kaydı çıkar (tamamlananlar atılır), sonra geri koy
+        live = []
+        while heap and len(live) < limit:
+            entry = heapq.heappop(heap)
+            if is_pending(entry):
+                live.append(entry)
+        for entry in live:
+            heapq.heappush(heap, entry)
         
-        return pending
+        return [reminders[index] for _, index in live]
     
     def mark_reminder_done(self, reminder_id: str) -> bool:
         """
@@ -593,17 +1463,21 @@ class L4MemorySystem:
             memory = self.load_memory()
             reminders = memory["memory"]["agent_notes"]["reminders"]
             
-            for reminder in reminders:
-                if reminder.get("id") == reminder_id:
-                    reminder["status"] = "done"
-                    reminder["completed_at"] = datetime.now().isoformat()
-                    
-                    self.save_memory(memory)
-                    logger.info(f"✅ Reminder marked done: {reminder_id}")
-                    return True
+            index = self._reminders_by_id.get(reminder_id)
+            if index is None:
+                logger.warning(f"Reminder not found: {reminder_id}")
+                return False
             
-            logger.warning(f"Reminder not found: {reminder_id}")
-            return False
+            # Heap kaydı get_pending_reminders'da lazy olarak atılır
+            reminder = reminders[index]
+            reminder["status"] = "done"
+            reminder["completed_at"] = self._now_iso()
+            
+            self._append_ops(memory, [
+                {"op": "set", "path": ["memory", "agent_notes", "reminders", index], "value": reminder}
+            ])
+            logger.info(f"✅ Reminder marked done: {reminder_id}")
+            return True
             
         except Exception as e:
             logger.error(f"Error marking reminder done: {e}")
@@ -621,13 +1495,16 @@ class L4MemorySystem:
         try:
             memory = self.load_memory()
             
-            memory["memory"]["agent_notes"]["daily_notes"][date] = {
+            daily_note = {
                 "summary": summary,
                 "highlights": highlights,
-                "created": datetime.now().isoformat()
+                "created": self._now_iso()
             }
+            memory["memory"]["agent_notes"]["daily_notes"][date] = daily_note
             
-            self.save_memory(memory)
+            self._append_ops(memory, [
+                {"op": "set", "path": ["memory", "agent_notes", "daily_notes", date], "value": daily_note}
+            ])
             logger.info(f"✅ Daily note added: {date}")
             
         except Exception as e:
@@ -652,17 +1529,30 @@ class L4MemorySystem:
             logger.warning("Minimax client not initialized")
             return None
         
+        # Aynı task + metin daha önce çıkarıldıysa API'ye gitme
+        cache_key = hashlib.blake2b(f"{task}\0{text}".encode('utf-8'), digest_size=16).hexdigest()
+        cached = self._extract_cache.get(cache_key)
+        if cached is not None:
+            self._extract_cache.move_to_end(cache_key)
+            return cached
+        
         try:
             # Minimax API call (Anthropic SDK ile)
+            # Sabit system + task ön eki önce (prompt cache), değişen metin en sonda
             message = self.minimax_client.messages.create(
                 model="MiniMax-M2",  # M2 model (hızlı + akıllı)
                 max_tokens=1000,
                 temperature=0.1,
-                system=f"You are an information extraction assistant. {task}\n\nAlways respond in valid JSON format.",
+                system="You are an information extraction assistant. Always respond in valid JSON format.",
                 messages=[
                     {
                         "role": "user",
                         "content": [
+                            {
+                                "type": "text",
+                                "text": task,
+                                "cache_control": {"type": "ephemeral"}
+                            },
                             {
                                 "type": "text",
                                 "text": text
@@ -678,17 +1568,20 @@ class L4MemorySystem:
                 if block.type == "text":
                     content += block.text
             
-            # Parse JSON
+            # Parse JSON (ilk '{'dan itibaren tek nesne; sonrasındaki metin yok sayılır)
+            json_start = content.find('{')
+            if json_start == -1:
+                return None
             try:
-                return json.loads(content)
+                extracted, _ = _JSON_DECODER.raw_decode(content, json_start)
             except json.JSONDecodeError:
-                # JSON extract
-                json_start = content.find('{')
-                json_end = content.rfind('}') + 1
-                if json_start != -1 and json_end > json_start:
-                    return json.loads(content[json_start:json_end])
                 return None
             
+            self._extract_cache[cache_key] = extracted
+            if len(self._extract_cache) > EXTRACT_CACHE_SIZE:
+                self._extract_cache.popitem(last=False)
+            return extracted
+            
         except Exception as e:
             logger.error(f"Minimax extraction error: {e}")
             return None
@@ -710,84 +1603,57 @@ class L4MemorySystem:
         memory = self.load_memory()
         current_profile = memory["user_profile"]
         
-        # Konuşmayı metne çevir
-        conversation_text = ""
+        # Konuşmayı metne çevir (parçalar listede toplanır, tek join ile birleştirilir)
+        lines = []
         for msg in messages[-10:]:  # Son 10 mesaj
             if isinstance(msg, dict):
                 role = msg.get("role", "user")
                 
                 # Hem 'content' (eski format) hem de 'parts' (Gemini API formatı) destekle
-                parts = msg.get("parts", [])
-                if not parts and "content" in msg: # Fallback for older format
+                parts = msg.get("parts")
+                if not parts:  # Fallback for older format
                     content_val = msg.get("content", "")
-                    parts = [content_val] if not isinstance(content_val, list) else content_val
-
+                    parts = content_val if isinstance(content_val, list) else ([content_val] if "content" in msg else [])
+                
                 content = " ".join(str(p) for p in parts)
-                conversation_text += f"{role}: {content}\n\n"
+                lines.append(f"{role}: {content}")
             else:
                 # String message (fallback)
-                conversation_text += f"{str(msg)}\n\n"
+                lines.append(str(msg))
+        conversation_text = "\n\n".join(lines)
         
-        # Minimax ile bilgi çıkar (mevcut profile ile)
-        task = f"""You are updating a user profile based on conversation.
-
-CURRENT USER PROFILE:
-{json.dumps(current_profile, ensure_ascii=False, indent=2)}
-
-TASK:
-Extract NEW information from the conversation and update ONLY the relevant fields.
-- Use the EXACT field structure from current profile
-- Update "basic" fields: name, age, occupation, location
-- Add to lists (expertise, interests) without duplicating
-- Create new contexts for important events/projects
-
-Return JSON format:
-{{
-  "user_profile_updates": {{
-    "basic.name": "...",
-    "basic.age": 16,
-    "basic.occupation": "...",
-    "expertise": ["skill1", "skill2"],
-    "interests": ["interest1"]
-  }},
-  "new_contexts": [
-    {{"type": "project", "title": "...", "data": {{...}}}}
-  ],
-  "action_items": ["..."]
-}}
-
-IMPORTANT:
-- Only include fields that have NEW information
-- Use dot notation for nested fields (e.g., "basic.name")
-- Don't duplicate existing information"""
+        # Minimax ile bilgi çıkar (mevcut profile ile - sabit talimatlar önce, profil sonda)
+        task = _PROFILE_UPDATE_INSTRUCTIONS + json.dumps(current_profile, ensure_ascii=False, indent=2)
         
         extracted = self.extract_info_with_minimax(conversation_text, task)
         
         if not extracted:
             return {"status": "extraction_failed"}
         
-        # User profile güncelle
-        if "user_profile_updates" in extracted:
-            for field_path, value in extracted["user_profile_updates"].items():
-                self.update_user_profile(field_path, value)
-        
-        # Yeni context'ler oluştur
-        if "new_contexts" in extracted:
-            for ctx in extracted["new_contexts"]:
-                # ctx dict mi kontrol et
-                if isinstance(ctx, dict):
-                    self.create_context(
-                        context_type=ctx.get("type", "general"),
-                        title=ctx.get("title", ""),
-                        data=ctx.get("data", {})
-                    )
-                else:
-                    # String ise, basit context oluştur
-                    self.create_context(
-                        context_type="general",
-                        title=str(ctx),
-                        data={}
-                    )
+        # Tüm güncellemeler tek WAL yazımında diske gider
+        with self._mutate():
+            # User profile güncelle
+            if "user_profile_updates" in extracted:
+                for field_path, value in extracted["user_profile_updates"].items():
+                    self.update_user_profile(field_path, value)
+            
+            # Yeni context'ler oluştur
+            if "new_contexts" in extracted:
+                for ctx in extracted["new_contexts"]:
+                    # ctx dict mi kontrol et
+                    if isinstance(ctx, dict):
+                        self.create_context(
+                            context_type=ctx.get("type", "general"),
+                            title=ctx.get("title", ""),
+                            data=ctx.get("data", {})
+                        )
+                    else:
+                        # String ise, basit context oluştur
+                        self.create_context(
+                            context_type="general",
+                            title=str(ctx),
+                            data={}
+                        )
         
         logger.info(f"✅ Auto-updated from conversation: {len(extracted.get('user_profile_updates', {}))} profile updates, {len(extracted.get('new_contexts', []))} new contexts")
         
@@ -799,15 +1665,99 @@ IMPORTANT:
     
     def get_context_for_gemini(self) -> str:
         """
-        Gemini için FULL L4 context hazırla (limit yok)
+        Gemini için sınırlı L4 context hazırla (en fazla MAX_GEMINI_BYTES)
+        
+        User profile, insights ve metadata her zaman eklenir. Kalan bütçe
+        sırasıyla bekleyen hatırlatıcılar (bitiş tarihine göre), context'ler
+        (aktif > öncelik > yeni) ve günlük notlar (yeniden eskiye) ile
+        doldurulur; sığmayanlar "omitted" altında sayılır. Sonuç bellek
+        değişene kadar cache'lenir.
 
         Returns:
-            Tüm L4 memory JSON string
+            L4 memory JSON string
         """
         memory = self.load_memory()
-
-        # Tüm L4'ü JSON olarak döndür
-        return json.dumps(memory, ensure_ascii=False, indent=2)
+        
+        cache_key = (self._generation, MAX_GEMINI_BYTES)
+        if self._gemini_cache is not None and self._gemini_cache[0] == cache_key:
+            return self._gemini_cache[1]
+        
+        context_json = self._assemble_gemini_context(memory, MAX_GEMINI_BYTES)
+        self._gemini_cache = (cache_key, context_json)
+        return context_json
+    
+    def _assemble_gemini_context(self, memory: Dict[str, Any], budget: int) -> str:
+        """
+        Bütçeye sığan compact JSON'u bölüm bölüm oluştur
+        
+        Args:
+            memory: Bellek
+            budget: Byte bütçesi
+        
+        Returns:
+            JSON string
+        """
+        contexts = memory["memory"]["contexts"]
+        agent_notes = memory["memory"]["agent_notes"]
+        daily_notes = agent_notes["daily_notes"]
+        
+        profile_chunk = _dumps(memory["user_profile"])
+        insights_chunk = _dumps(memory["memory"].get("insights", {}))
+        metadata_chunk = _dumps(memory["metadata"])
+        
+        # Sabit bölümler + anahtarlar/omitted sayaçları için pay
+        remaining = budget - len(profile_chunk) - len(insights_chunk) - len(metadata_chunk) - 256
+        
+        def fill(items: List[bytes]) -> Tuple[List[bytes], int]:
+            """Sırayla bütçeye sığanları al; ilk sığmayanda dur (deterministik)"""
+            nonlocal remaining
+            taken = []
+            for item in items:
+                cost = len(item) + 1  # ayırıcı virgül
+                if cost > remaining:
+                    break
+                remaining -= cost
+                taken.append(item)
+            return taken, len(items) - len(taken)
+        
+        reminder_chunks, reminders_omitted = fill([
+            _dumps(reminder) for reminder in self.get_pending_reminders()
+        ])
+        
+        ranked_contexts = sorted(
+            (item for item in contexts.items() if item[1] is not None),
+            key=lambda item: (
+                item[1].get("status") == "active",
+                _PRIORITY_SCORES.get(item[1].get("priority"), 0),
+                item[1].get("created") or ""
+            ),
+            reverse=True
+        )
+        context_chunks, contexts_omitted = fill([
+            _dumps(context_id) + b":" + _dumps(context) for context_id, context in ranked_contexts
+        ])
+        
+        note_chunks, notes_omitted = fill([
+            _dumps(date) + b":" + _dumps(daily_notes[date])
+            for date in sorted(daily_notes, reverse=True)
+        ])
+        
+        omitted = _dumps({
+            "contexts": contexts_omitted,
+            "reminders": reminders_omitted,
+            "daily_notes": notes_omitted
+        })
+        
+        return b"".join((
+            b'{"user_profile":', profile_chunk,
+            b',"memory":{"contexts":{', b",".join(context_chunks),
+            b'},"agent_notes":{"reminders":[', b",".join(reminder_chunks),
+            b'],"daily_notes":{', b",".join(note_chunks),
+            b'}},"insights":', insights_chunk,
+            b'},"metadata":', metadata_chunk,
+            b',"omitted":', omitted,
+            b'}'
+        )).decode('utf-8')
 
 
     # ============================================================================
@@ -816,42 +1766,58 @@ IMPORTANT:
     
     def get_statistics(self) -> Dict[str, Any]:
         """
-        L4 istatistikleri
+        L4 istatistikleri (bellek değişene kadar cache'lenir)
         
         Returns:
             İstatistikler
         """
         memory = self.load_memory()
         
-        return {
+        if self._stats_cache is not None and self._stats_cache[0] == self._generation:
+            return self._stats_cache[1]
+        
+        reminders = memory["memory"]["agent_notes"]["reminders"]
+        stats = {
             "total_contexts": len(memory["memory"]["contexts"]),
-            "total_reminders": len(memory["memory"]["agent_notes"]["reminders"]),
-            "pending_reminders": len([r for r in memory["memory"]["agent_notes"]["reminders"] if r.get("status") == "pending"]),
+            "total_reminders": len(reminders),
+            # Pending heap'teki canlı kayıtlar (tüm listeyi taramadan)
+            "pending_reminders": sum(1 for _, index in self._pending_heap if reminders[index].get("status") == "pending"),
             "user_profile_completeness": self._calculate_profile_completeness(memory["user_profile"]),
             "last_updated": memory["metadata"]["last_updated"],
             "version": memory["metadata"]["version"]
         }
+        self._stats_cache = (self._generation, stats)
+        return stats
     
     def _calculate_profile_completeness(self, profile: Dict[str, Any]) -> float:
-        """Profile completeness hesapla (0.0-1.0)"""
-        total_fields = 0
+        """Profile completeness hesapla (0.0-1.0) - şemadaki yaprak alanların (PROFILE_LEAF_PATHS) dolu olanları"""
         filled_fields = 0
-        
-        def count_fields(obj):
-            nonlocal total_fields, filled_fields
-            if isinstance(obj, dict):
-                for value in obj.values():
-                    if isinstance(value, (dict, list)):
-                        count_fields(value)
-                    else:
-                        total_fields += 1
-                        if value:  # Not empty
-                            filled_fields += 1
-            elif isinstance(obj, list):
-                total_fields += 1
-                if obj:  # Not empty
+        for getter in PROFILE_FIELD_GETTERS:
+            try:
+                if getter(profile):  # Not empty
                     filled_fields += 1
+            except (KeyError, TypeError):
+                # Alan yok ya da ara değer dict değil
+                pass
         
-        count_fields(profile)
-        
-        return filled_fields / total_fields if total_fields > 0 else 0.0
+        return filled_fields / len(PROFILE_FIELD_GETTERS)
+
+
+def _leaf_paths(obj: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> Tuple[Tuple[str, ...], ...]:
+    """Şemadaki yaprak alanların path'leri (listeler tek alan sayılır, boş dict'ler hiç sayılmaz)"""
+    paths = []
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            paths.extend(_leaf_paths(value, prefix + (key,)))
+        else:
+            paths.append(prefix + (key,))
+    return tuple(paths)
+
+
+# User profile şemasının yaprak alanları (completeness hesabı için, import sırasında bir kez)
+PROFILE_LEAF_PATHS = _leaf_paths(L4MemorySystem._initial_memory()["user_profile"])
+
+# Her yaprak için derlenmiş erişici: getter(profile) == profile[a][b]... (C seviyesinde reduce)
+PROFILE_FIELD_GETTERS = tuple(
+    functools.partial(functools.reduce, operator.getitem, path) for path in PROFILE_LEAF_PATHS
+)
@@ -2,28 +2,116 @@
 Email mesajlarını parse etme modülü
 """
 
+import asyncio
+import functools
 import imaplib
 import json
-from email.parser import Parser
+import logging
+import queue
+import re
+import threading
+from collections import Counter
+from email import policy
+from email.parser import BytesHeaderParser, BytesParser
 from email.utils import parsedate_to_datetime
 from email.header import decode_header, make_header
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Hızlı JSON (orjson varsa), yoksa stdlib json
+try:
+    import orjson
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+# asyncio tabanlı fetch için (opsiyonel)
+try:
+    import aioimaplib
+except ImportError:
+    aioimaplib = None
+
+# Tek FETCH komutunda istenecek varsayılan email sayısı (çok büyük olursa sunucu
+# "maximum request size exceeded" ile BAD dönebilir)
+DEFAULT_FETCH_BATCH_SIZE = 100
+
+# PEEK ile çekilir: \Seen bayrağı değişmez (email okunmuş sayılmaz)
+TRIAGE_FETCH_ITEMS = '(BODY.PEEK[HEADER.FIELDS (FROM TO SUBJECT DATE MESSAGE-ID)])'
+FULL_FETCH_ITEMS = '(BODY.PEEK[])'
+
+# Parser'lar durumsuzdur (her parsebytes yeni FeedParser kurar), thread'ler paylaşabilir
+_PARSER = BytesParser(policy=policy.default)
+# Başlık ayıklaması için: boş satırda durur, gövde/MIME ağacı kurulmaz
+_HEADER_PARSER = BytesHeaderParser(policy=policy.default)
+
+# UID FETCH yanıtındaki UID alanı (zarfta veya literal'den sonraki kapanış satırında)
+_UID_RE = re.compile(rb'\bUID (\d+)')
+
+
+def _format_id_set(email_ids: List[bytes]) -> bytes:
+    """
+    UID listesini IMAP sequence-set'ine çevir (ardışık UID'ler N:M aralığı olur)
+    
+    Örnek: [b'1', b'2', b'3', b'7'] -> b'1:3,7'
+    """
+    parts = []
+    run_start = run_end = None
+    for email_id in email_ids:
+        number = int(email_id)
+        if run_end is not None and number == run_end + 1:
+            run_end = number
+            continue
+        if run_start is not None:
+            parts.append(f"{run_start}:{run_end}" if run_end != run_start else str(run_start))
+        run_start = run_end = number
+    if run_start is not None:
+        parts.append(f"{run_start}:{run_end}" if run_end != run_start else str(run_start))
+    return ",".join(parts).encode('ascii')
+
+
+def _uid_parts(msg_data: List) -> List[tuple]:
+    """
+    UID FETCH yanıtından (UID, ham içerik) çiftlerini çıkar
+    
+    Yanıt (zarf, içerik) tuple'ları ve aralarda kapanış satırlarından oluşur.
+    Sunucu UID'yi zarfta (b'12 (UID 345 BODY[] {3456}') veya literal'den
+    sonra (b' UID 345)') gönderebilir; zarftaki ilk token sequence number'dır
+    ve başka bağlantılarda geçersizdir, kullanılmaz.
+    
+    Args:
+        msg_data: imaplib biçiminde yanıt listesi
+    
+    Returns:
+        (UID, bytes) listesi (UID'si bulunamayan kayıtlar atlanır)
+    """
+    parts = []
+    for part in msg_data:
+        if isinstance(part, tuple):
+            match = _UID_RE.search(part[0])
+            parts.append([match.group(1) if match else None, part[1]])
+        elif parts and parts[-1][0] is None and isinstance(part, (bytes, bytearray)):
+            match = _UID_RE.search(part)
+            if match:
+                parts[-1][0] = match.group(1)
+    return [(uid, data) for uid, data in parts if uid is not None]
+
 
 class EmailParser:
     """Email mesajlarını IMAP üzerinden çeker ve parse eder"""
     
     def __init__(self, email_address: str, password: str, 
                  imap_server: str = "imap.gmail.com", imap_port: int = 993,
-                 max_workers: int = 5):
+                 max_workers: int = 5, fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+                 parse_processes: int = 0, spam_triage: bool = False):
         """
         EmailParser başlat
         
@@ -33,15 +121,32 @@ class EmailParser:
             imap_server: IMAP sunucu adresi
             imap_port: IMAP port numarası
             max_workers: Paralel işlem sayısı (varsayılan: 5)
+            fetch_batch_size: Tek FETCH komutunda çekilecek email sayısı (varsayılan: 100)
+            parse_processes: Email parse için ayrı process sayısı (0 = fetch
+                thread'lerinde parse et; büyük mailbox'larda GIL'i aşmak için)
+            spam_triage: Tam içerikten önce sadece başlıkları çekip _is_spam ile
+                ayıkla (batch başına ek bir FETCH; yalnızca gerçek bir spam
+                kontrolü varsa, örn. _is_spam override edildiğinde, faydalı)
         """
         self.email_address = email_address
         self.password = password
         self.imap_server = imap_server
         self.imap_port = imap_port
         self.max_workers = max_workers
+        self.fetch_batch_size = max(1, fetch_batch_size)
+        self.spam_triage = spam_triage
         self.mail = None
         self.emails = []
-        self.emails_lock = Lock()
+        
+        # Paralel fetch için kalıcı (login olmuş, klasörü seçili) bağlantı havuzu;
+        # None slot = bağlantı koptu, kullanılırken yeniden açılır
+        self._pool: Optional["queue.Queue[Optional[imaplib.IMAP4_SSL]]"] = None
+        self._pool_folder: Optional[str] = None
+        
+        # Parse için process havuzu (parse_processes > 0 ise ilk kullanımda açılır)
+        self.parse_processes = max(0, parse_processes)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
     
     def connect(self) -> bool:
         """
@@ -61,7 +166,12 @@ class EmailParser:
             return False
     
     def disconnect(self):
-        """IMAP bağlantısını kapat"""
+        """IMAP bağlantısını (ve paralel fetch/parse havuzlarını) kapat"""
+        self._close_pool()
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
         if self.mail:
             try:
                 self.mail.close()
@@ -91,7 +201,8 @@ class EmailParser:
             logger.info(f"{folder} klasöründen email'ler çekiliyor...")
             self.mail.select(folder)
             
-            status, messages = self.mail.search(None, 'ALL')
+            # UID'ler oturumdan bağımsızdır; havuzdaki diğer bağlantılarda da geçerli
+            status, messages = self.mail.uid('SEARCH', None, 'ALL')
             email_ids = messages[0].split()
             
             # Limit varsa son 'limit' email'i al
@@ -103,7 +214,7 @@ class EmailParser:
             
             if parallel and total > 10:
                 logger.info(f"Paralel işlem kullanılıyor ({self.max_workers} thread)")
-                return self._fetch_emails_parallel(email_ids)
+                return self._fetch_emails_parallel(email_ids, folder)
             else:
                 logger.info("Seri işlem kullanılıyor")
                 return self._fetch_emails_serial(email_ids)
@@ -141,7 +252,7 @@ class EmailParser:
             self.mail.select('INBOX')
             
             # IMAP search
-            status, messages = self.mail.search(None, search_criteria)
+            status, messages = self.mail.uid('SEARCH', None, search_criteria)
             email_ids = messages[0].split()
             
             if not email_ids:
@@ -157,7 +268,7 @@ class EmailParser:
             
             if parallel and total > 10:
                 logger.info(f"Paralel işlem kullanılıyor ({self.max_workers} thread)")
-                return self._fetch_emails_parallel(email_ids)
+                return self._fetch_emails_parallel(email_ids, 'INBOX')
             else:
                 logger.info("Seri işlem kullanılıyor")
                 return self._fetch_emails_serial(email_ids)
@@ -168,7 +279,7 @@ class EmailParser:
     
     def _fetch_emails_serial(self, email_ids: List[bytes]) -> List[Dict]:
         """
-        Email'leri seri olarak çek (eski yöntem)
+        Email'leri seri olarak çek (ana bağlantı üzerinden, toplu FETCH ile)
         
         Args:
             email_ids: Email ID listesi
@@ -179,106 +290,477 @@ class EmailParser:
         self.emails = []
         total = len(email_ids)
         
-        for idx, email_id in enumerate(email_ids, 1):
+        for start in range(0, total, self.fetch_batch_size):
+            batch = email_ids[start:start + self.fetch_batch_size]
             try:
-                status, msg_data = self.mail.fetch(email_id, '(RFC822)')
-                msg = Parser().parsestr(msg_data[0][1].decode('utf-8', errors='ignore'))
-                
-                email_obj = self._parse_email_message(msg)
-                self.emails.append(email_obj)
-                
-                # İlerleme göster
-                if idx % 50 == 0 or idx == total:
-                    percent = (idx * 100) // total
-                    logger.info(f"İşleniyor: {idx}/{total} ({percent}%)")
-            
+                self.emails.extend(self._fetch_batch(self.mail, batch))
             except Exception as e:
-                logger.warning(f"Email parse hatası (ID: {email_id}): {str(e)[:50]}")
+                logger.warning("Email batch hatası (ID: %s..%s): %.50s", batch[0], batch[-1], e)
                 continue
+            
+            # İlerleme göster
+            done = start + len(batch)
+            percent = (done * 100) // total
+            logger.info("İşleniyor: %d/%d (%d%%)", done, total, percent)
         
         logger.info(f"{len(self.emails)} email çekildi")
         return self.emails
     
-    def _fetch_emails_parallel(self, email_ids: List[bytes]) -> List[Dict]:
+    def _fetch_emails_parallel(self, email_ids: List[bytes], folder: str = 'INBOX') -> List[Dict]:
         """
         Email'leri paralel olarak çek (hızlı)
         
+        ID'ler max_workers adet ardışık parçaya bölünür; her worker havuzdan
+        tek bir bağlantı alıp kendi parçasını batch'ler halinde FETCH eder.
+        
         Args:
             email_ids: Email ID listesi
+            folder: ID'lerin ait olduğu klasör
         
         Returns:
             Parse edilmiş email listesi
         """
-        self.emails = []
+        self._ensure_pool(folder)
+        
+        # Sonuçları sadece ana thread ekler - kilide gerek yok
+        emails = []
         total = len(email_ids)
         processed = 0
         
+        # Worker başına bir ardışık ID aralığı
+        chunk_size = -(-total // self.max_workers)
+        chunks = [email_ids[i:i + chunk_size] for i in range(0, total, chunk_size)]
+        
         # ThreadPoolExecutor ile paralel işlem
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Her thread için ayrı IMAP bağlantısı oluştur
-            future_to_id = {
-                executor.submit(self._fetch_single_email, email_id): email_id 
-                for email_id in email_ids
+            # Görevler havuzdaki kalıcı bağlantıları paylaşır
+            future_to_chunk = {
+                executor.submit(self._fetch_chunk, chunk): chunk
+                for chunk in chunks
             }
             
-            # Sonuçları topla
-            for future in as_completed(future_to_id):
-                email_id = future_to_id[future]
+            # Sonuçları topla (worker başına tek birleştirme)
+            for future in as_completed(future_to_chunk):
+                chunk = future_to_chunk[future]
                 try:
-                    email_obj = future.result()
-                    if email_obj:
-                        with self.emails_lock:
-                            self.emails.append(email_obj)
-                    
-                    processed += 1
-                    
-                    # İlerleme göster
-                    if processed % 50 == 0 or processed == total:
-                        percent = (processed * 100) // total
-                        logger.info(f"İşleniyor: {processed}/{total} ({percent}%)")
+                    emails.extend(future.result())
                 
                 except Exception as e:
-                    logger.warning(f"Email parse hatası: {str(e)[:50]}")
-                    processed += 1
+                    logger.warning("Email parse hatası: %.50s", e)
+                
+                processed += len(chunk)
+                
+                # İlerleme göster
+                percent = (processed * 100) // total
+                logger.info("İşleniyor: %d/%d (%d%%)", processed, total, percent)
         
+        self.emails = emails
         logger.info(f"{len(self.emails)} email çekildi (paralel)")
         return self.emails
     
-    def _fetch_single_email(self, email_id: bytes) -> Optional[Dict]:
+    def _fetch_chunk(self, email_ids: List[bytes]) -> List[Dict]:
+        """
+        Bir worker'ın ID aralığını havuzdaki tek bir bağlantıyla çek (thread-safe)
+        
+        Aralık fetch_batch_size'lık FETCH komutlarıyla çekilir, sonuçlar yerel
+        listede toplanır. Herhangi bir hatada bağlantı kapatılıp yeniden açılır;
+        bağlantı hatalarında (imaplib.IMAP4.abort, OSError) o batch bir kez daha
+        denenir, diğer hatalarda batch atlanır ve WARNING loglanır.
+        
+        Args:
+            email_ids: Email ID listesi
+        
+        Returns:
+            Parse edilmiş email listesi (çekilemeyen batch'ler atlanır)
+        """
+        chunk_emails = []
+        mail = self._pool.get()
+        try:
+            for start in range(0, len(email_ids), self.fetch_batch_size):
+                batch = email_ids[start:start + self.fetch_batch_size]
+                for attempt in range(2):
+                    try:
+                        if mail is None:
+                            mail = self._open_connection(self._pool_folder)
+                        chunk_emails.extend(self._fetch_batch(mail, batch))
+                        break
+                    except Exception as e:
+                        # Yanıtı yarım okunmuş olabilecek bağlantı havuza geri dönmemeli;
+                        # bırak, bir sonraki kullanımda yeniden aç
+                        self._logout_quietly(mail)
+                        mail = None
+                        # Sadece bağlantı hataları (kopma, timeout) bir kez yeniden denenir
+                        if not attempt and isinstance(e, (imaplib.IMAP4.abort, OSError)):
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("IMAP bağlantısı koptu, yeniden bağlanılıyor: %.50s", e)
+                            continue
+                        logger.warning("Email batch atlandı (ID: %s..%s): %.50s", batch[0], batch[-1], e)
+                        break
+        finally:
+            self._pool.put(mail)
+        
+        return chunk_emails
+    
+    async def fetch_emails_async(self, folder: str = 'INBOX',
+                                 limit: Optional[int] = None) -> List[Dict]:
         """
-        Tek bir email'i çek (thread-safe)
+        Email'leri asyncio + aioimaplib ile çek
+        
+        connect() gerektirmez: max_workers adet bağlantı açılır, her biri
+        ardışık bir ID aralığını fetch_batch_size'lık toplu FETCH'lerle çeker.
+        aioimaplib kurulu değilse thread tabanlı fetch_emails kullanılır.
         
         Args:
-            email_id: Email ID
+            folder: Email klasörü (INBOX, Sent, etc.)
+            limit: Maksimum email sayısı (None = tümü)
         
         Returns:
-            Parse edilmiş email objesi veya None
+            Parse edilmiş email listesi
         """
+        if aioimaplib is None:
+            logger.warning("aioimaplib not installed. Install with: pip install aioimaplib")
+            return await asyncio.to_thread(self.fetch_emails, folder, limit)
+        
+        logger.info(f"{folder} klasöründen email'ler çekiliyor (asyncio)...")
+        results = await asyncio.gather(
+            *(self._open_connection_async(folder) for _ in range(self.max_workers)),
+            return_exceptions=True
+        )
+        conns = [conn for conn in results if not isinstance(conn, BaseException)]
+        if not conns:
+            logger.error(f"IMAP bağlantı hatası: {results[0]}")
+            return []
+        
+        emails = []
         try:
-            # Her thread için yeni IMAP bağlantısı
-            mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port, timeout=30)
-            mail.login(self.email_address, self.password)
-            mail.select('INBOX')
+            response = await conns[0].uid_search('ALL')
+            if response.result != 'OK':
+                raise imaplib.IMAP4.error(f"SEARCH başarısız: {response.result}")
+            email_ids = bytes(response.lines[0]).split()
             
-            # Email'i çek
-            status, msg_data = mail.fetch(email_id, '(RFC822)')
-            msg = Parser().parsestr(msg_data[0][1].decode('utf-8', errors='ignore'))
+            # Limit varsa son 'limit' email'i al
+            if limit:
+                email_ids = email_ids[-limit:]
             
-            # Parse et
-            email_obj = self._parse_email_message(msg)
+            total = len(email_ids)
+            logger.info(f"{total} email bulundu, işleniyor...")
             
-            # Bağlantıyı kapat
-            mail.close()
-            mail.logout()
+            # Bağlantı başına bir ardışık ID aralığı
+            chunk_size = -(-total // len(conns)) or 1
+            chunks = [email_ids[i:i + chunk_size] for i in range(0, total, chunk_size)]
             
-            return email_obj
+            chunk_results = await asyncio.gather(
+                *(self._fetch_chunk_async(conn, chunk, folder) for conn, chunk in zip(conns, chunks)),
+                return_exceptions=True
+            )
+            for result in chunk_results:
+                if isinstance(result, BaseException):
+                    logger.warning("Email çekme hatası: %.50s", result)
+                else:
+                    emails.extend(result)
         
         except Exception as e:
-            logger.debug(f"Email ��ekme hatası (ID: {email_id}): {str(e)[:50]}")
-            return None
+            logger.error(f"Email çekme hatası: {e}")
+        
+        finally:
+            await asyncio.gather(*(self._logout_quietly_async(conn) for conn in conns))
+        
+        self.emails = emails
+        logger.info(f"{len(self.emails)} email çekildi (asyncio)")
+        return self.emails
+    
+    async def _fetch_chunk_async(self, conn, email_ids: List[bytes], folder: str) -> List[Dict]:
+        """
+        Bir ID aralığını tek aioimaplib bağlantısıyla batch'ler halinde çek
+        
+        Hata olan batch yeni bir bağlantıyla bir kez daha denenir; yine
+        başarısız olursa atlanır ve WARNING loglanır (_fetch_chunk gibi).
+        
+        Args:
+            conn: Klasörü seçilmiş aioimaplib bağlantısı (çağıran kapatır)
+            email_ids: Email ID listesi
+            folder: Yeni bağlantıda seçilecek klasör
+        
+        Returns:
+            Parse edilmiş email listesi (çekilemeyen batch'ler atlanır)
+        """
+        chunk_emails = []
+        own_conn = None  # Hatadan sonra açılan bağlantı (bu fonksiyon kapatır)
+        try:
+            for start in range(0, len(email_ids), self.fetch_batch_size):
+                batch = email_ids[start:start + self.fetch_batch_size]
+                for attempt in range(2):
+                    try:
+                        if conn is None:
+                            conn = own_conn = await self._open_connection_async(folder)
+                        chunk_emails.extend(await self._fetch_batch_async(conn, batch))
+                        break
+                    except Exception as e:
+                        # Yanıtı yarım okunmuş olabilecek bağlantı tekrar kullanılmamalı
+                        if own_conn is not None:
+                            await self._logout_quietly_async(own_conn)
+                        conn = own_conn = None
+                        if not attempt:
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("IMAP batch hatası, yeni bağlantıyla yeniden deneniyor: %.50s", e)
+                            continue
+                        logger.warning("Email batch atlandı (ID: %s..%s): %.50s", batch[0], batch[-1], e)
+        finally:
+            if own_conn is not None:
+                await self._logout_quietly_async(own_conn)
+        
+        return chunk_emails
+    
+    async def _fetch_batch_async(self, conn, email_ids: List[bytes]) -> List[Dict]:
+        """
+        _fetch_batch'in aioimaplib karşılığı
+        
+        Args:
+            conn: Klasörü seçilmiş aioimaplib bağlantısı
+            email_ids: Email ID listesi
+        
+        Returns:
+            Parse edilmiş email listesi (email_ids sırasıyla)
+        """
+        parsed, body_ids = {}, email_ids
+        if self.spam_triage:
+            parsed, body_ids = self._triage_headers(
+                await self._fetch_parts_async(conn, email_ids, TRIAGE_FETCH_ITEMS)
+            )
+        if body_ids:
+            parts = await self._fetch_parts_async(conn, body_ids, FULL_FETCH_ITEMS)
+            if self.parse_processes:
+                # Process havuzunun map'i bloklar; event loop'u bekletmemek için thread'de
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._parse_full_messages, parts, parsed
+                )
+            else:
+                self._parse_full_messages(parts, parsed)
+        return [parsed[email_id] for email_id in email_ids if email_id in parsed]
+    
+    async def _open_connection_async(self, folder: str):
+        """Yeni aioimaplib bağlantısı aç, login ol ve klasörü seç"""
+        conn = aioimaplib.IMAP4_SSL(host=self.imap_server, port=self.imap_port, timeout=30)
+        await conn.wait_hello_from_server()
+        response = await conn.login(self.email_address, self.password)
+        if response.result != 'OK':
+            await self._logout_quietly_async(conn)
+            raise imaplib.IMAP4.error(f"LOGIN başarısız: {response.result}")
+        await conn.select(folder)
+        return conn
+    
+    @staticmethod
+    async def _fetch_parts_async(conn, email_ids: List[bytes], items: str) -> List[tuple]:
+        """
+        _fetch_parts'ın aioimaplib karşılığı
+        
+        Args:
+            conn: Klasörü seçilmiş aioimaplib bağlantısı
+            email_ids: Email ID listesi
+            items: FETCH öğeleri
+        
+        Returns:
+            (UID, bytes) listesi
+        """
+        response = await conn.uid('fetch', _format_id_set(email_ids).decode('ascii'), items)
+        if response.result != 'OK':
+            raise imaplib.IMAP4.error(f"FETCH başarısız: {response.result}")
+        
+        # Literal içerik bytearray olarak, zarf satırının (b'12 FETCH (UID 345 BODY[] {3456}')
+        # hemen ardından gelir; imaplib biçimine çevirip _uid_parts'a ver
+        msg_data = []
+        envelope = None
+        for line in response.lines:
+            if isinstance(line, bytearray) and envelope is not None:
+                msg_data.append((envelope, bytes(line)))
+                envelope = None
+            else:
+                if envelope is not None:
+                    msg_data.append(envelope)
+                envelope = line
+        if envelope is not None:
+            msg_data.append(envelope)
+        return _uid_parts(msg_data)
+    
+    @staticmethod
+    async def _logout_quietly_async(conn):
+        """aioimaplib bağlantısını hata fırlatmadan kapat"""
+        try:
+            await conn.logout()
+        except Exception:
+            pass
+    
+    def _open_connection(self, folder: str) -> imaplib.IMAP4_SSL:
+        """Yeni IMAP bağlantısı aç, login ol ve klasörü seç"""
+        mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port, timeout=30)
+        mail.login(self.email_address, self.password)
+        mail.select(folder)
+        return mail
+    
+    def _ensure_pool(self, folder: str):
+        """
+        max_workers adet bağlantıyı (paralel olarak) açıp havuza koy
+        
+        Havuz zaten bu klasör için açıksa tekrar kullanılır. Açılamayan
+        slot'lar None olarak eklenir ve ilk kullanımda yeniden denenir.
+        """
+        if self._pool is not None and self._pool_folder == folder:
+            return
+        self._close_pool()
+        
+        def open_slot(_) -> Optional[imaplib.IMAP4_SSL]:
+            try:
+                return self._open_connection(folder)
+            except Exception as e:
+                logger.warning("IMAP havuz bağlantısı açılamadı: %s", e)
+                return None
+        
+        pool = queue.Queue()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for mail in executor.map(open_slot, range(self.max_workers)):
+                pool.put(mail)
+        
+        self._pool = pool
+        self._pool_folder = folder
+    
+    def _close_pool(self):
+        """Havuzdaki tüm bağlantıları kapat"""
+        if self._pool is None:
+            return
+        
+        while True:
+            try:
+                mail = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._logout_quietly(mail)
+        
+        self._pool = None
+        self._pool_folder = None
+    
+    @staticmethod
+    def _logout_quietly(mail: Optional[imaplib.IMAP4]):
+        """Bağlantıyı hata fırlatmadan kapat"""
+        if mail is None:
+            return
+        try:
+            mail.close()
+            mail.logout()
+        except Exception:
+            pass
+    
+    def _fetch_batch(self, mail: imaplib.IMAP4, email_ids: List[bytes]) -> List[Dict]:
+        """
+        Birden fazla email'i toplu FETCH ile çek ve parse et
+        
+        spam_triage açıksa önce sadece başlıklar çekilir (~1KB/email), tam
+        içerik yalnızca spam olmayan email'ler için ikinci FETCH ile istenir;
+        spam email'ler gövdesiz olarak döner. Kapalıysa tek FETCH yapılır.
+        
+        Args:
+            mail: Mailbox'ı seçilmiş IMAP bağlantısı
+            email_ids: Email ID listesi
+        
+        Returns:
+            Parse edilmiş email listesi (email_ids sırasıyla)
+        """
+        parsed, body_ids = {}, email_ids
+        if self.spam_triage:
+            parsed, body_ids = self._triage_headers(
+                self._fetch_parts(mail, email_ids, TRIAGE_FETCH_ITEMS)
+            )
+        if body_ids:
+            self._parse_full_messages(self._fetch_parts(mail, body_ids, FULL_FETCH_ITEMS), parsed)
+        
+        return [parsed[email_id] for email_id in email_ids if email_id in parsed]
+    
+    def _triage_headers(self, parts: List[tuple]) -> Tuple[Dict[bytes, Dict], List[bytes]]:
+        """
+        Başlık FETCH sonuçlarından spam'leri ayıkla
+        
+        Args:
+            parts: (ID, başlık byte'ları) listesi
+        
+        Returns:
+            (gövdesiz parse edilmiş spam email'ler {ID: email}, gövdesi çekilecek ID'ler)
+        """
+        parsed = {}
+        body_ids = []
+        for seq, raw in parts:
+            try:
+                headers = _HEADER_PARSER.parsebytes(raw)
+                if self._is_spam(self._decode_header_value(headers.get('From')),
+                                 self._decode_header_value(headers.get('Subject'))):
+                    parsed[seq] = self._parse_email_message(headers)
+                else:
+                    body_ids.append(seq)
+            except Exception as e:
+                logger.warning("Email başlık hatası (ID: %r): %.50s", seq, e)
+        
+        return parsed, body_ids
+    
+    def _parse_full_messages(self, parts: List[tuple], parsed: Dict[bytes, Dict]):
+        """
+        Tam içerik FETCH sonuçlarını parse edip parsed sözlüğüne ekle
+        
+        Args:
+            parts: (ID, ham email byte'ları) listesi
+            parsed: {ID: email} sözlüğü (yerinde güncellenir)
+        """
+        if self.parse_processes:
+            # Thread'ler sadece I/O yapar; MIME parse işi process havuzunda
+            results = self._get_process_pool().map(
+                functools.partial(_parse_raw_email, type(self)),
+                [raw for _, raw in parts],
+                chunksize=16
+            )
+            for (seq, _), (email, error) in zip(parts, results):
+                if error is None:
+                    parsed[seq] = email
+                else:
+                    logger.warning("Email parse hatası (ID: %r): %.50s", seq, error)
+            return
+        
+        for seq, raw in parts:
+            try:
+                # Ham byte'lar doğrudan parse edilir; charset çözümü parça bazında yapılır
+                msg = _PARSER.parsebytes(raw)
+                parsed[seq] = self._parse_email_message(msg)
+            except Exception as e:
+                logger.warning("Email parse hatası (ID: %r): %.50s", seq, e)
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Parse process havuzunu (gerekirse) aç; fetch thread'leri tarafından paylaşılır"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.parse_processes)
+            return self._process_pool
+    
+    @staticmethod
+    def _fetch_parts(mail: imaplib.IMAP4, email_ids: List[bytes], items: str) -> List[tuple]:
+        """
+        Tek UID FETCH komutu gönder ve (UID, ham içerik) çiftlerini döndür
+        
+        Args:
+            mail: Mailbox'ı seçilmiş IMAP bağlantısı
+            email_ids: Email UID listesi
+            items: FETCH öğeleri (örn: '(BODY.PEEK[])')
+        
+        Returns:
+            (UID, bytes) listesi
+        """
+        status, msg_data = mail.uid('FETCH', _format_id_set(email_ids), items)
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"FETCH başarısız: {status}")
+        return _uid_parts(msg_data)
     
     def _decode_header_value(self, value: Optional[str]) -> str:
         """Decode MIME-encoded header to a readable Unicode string."""
+        if value is None:
+            return ""
+        if hasattr(value, 'defects'):
+            # policy.default header nesnesi: parse sırasında zaten çözüldü
+            return str(value)
         try:
             return str(make_header(decode_header(value or "")))
         except Exception:
@@ -300,21 +782,24 @@ class EmailParser:
         except:
             timestamp = datetime.now().isoformat()
         
-        # Decode headers to store readable text
+        # Decode headers to store readable text (each header decoded exactly once)
         msg_id = msg.get('Message-ID', '')
         from_decoded = self._decode_header_value(msg.get('From', ''))
         to_decoded = self._decode_header_value(msg.get('To', ''))
         subject_decoded = self._decode_header_value(msg.get('Subject', ''))
+        # 'Ad <adres>' -> 'Ad' (istatistiklerde gönderici gruplaması için)
+        from_name = from_decoded.split('<', 1)[0].strip() or from_decoded
         
         return {
             'id': msg_id,
             'from': from_decoded,
+            'from_name': from_name,
             'to': to_decoded,
             'subject': subject_decoded,
             'body': self._get_email_body(msg),
             'timestamp': timestamp,
             'source': 'email',
-            'is_spam': self._is_spam(msg)
+            'is_spam': self._is_spam(from_decoded, subject_decoded)
         }
     
     def _get_email_body(self, msg) -> str:
@@ -327,30 +812,26 @@ class EmailParser:
         Returns:
             Email gövdesi (ilk 1000 karakter)
         """
-        body = ""
+        # text/plain tercih edilir; sadece HTML gövdeli email'lerde HTML döner
+        part = msg.get_body(preferencelist=('plain', 'html'))
+        if part is None:
+            return ""
         
-        if msg.is_multipart():
-            for part in msg.walk():
-                if part.get_content_type() == "text/plain":
-                    try:
-                        body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                        break
-                    except:
-                        continue
-        else:
-            try:
-                body = msg.get_payload(decode=True).decode('utf-8', errors='ignore')
-            except:
-                body = str(msg.get_payload())
+        try:
+            body = part.get_content()
+        except (LookupError, UnicodeError):
+            # Bilinmeyen/bozuk charset
+            body = (part.get_payload(decode=True) or b'').decode('utf-8', errors='ignore')
         
         return body[:1000]  # İlk 1000 karakter
     
-    def _is_spam(self, msg) -> bool:
+    def _is_spam(self, from_decoded: str, subject_decoded: str) -> bool:
         """
         Email'in spam/reklam olup olmadığını kontrol et
 
         Args:
-            msg: Email message objesi
+            from_decoded: Çözülmüş From header'ı
+            subject_decoded: Çözülmüş Subject header'ı
 
         Returns:
             Spam ise True
@@ -368,40 +849,28 @@ class EmailParser:
         if not self.emails:
             return {}
         
-        stats = {
+        # Gönderici istatistikleri (from_name parse sırasında hesaplanır; eski
+        # JSON'lardan yüklenen email'lerde yoksa 'from' alanından türetilir)
+        senders = Counter(
+            e.get('from_name') or e.get('from', 'unknown').split('<', 1)[0].strip() or e.get('from', 'unknown')
+            for e in self.emails
+        )
+        timestamps = [e['timestamp'] for e in self.emails]
+        
+        return {
             'total_emails': len(self.emails),
             'spam_count': sum(1 for e in self.emails if e['is_spam']),
-            'senders': {},
+            # En çok email gönderen 10 kişi
+            'senders': dict(senders.most_common(10)),
             'date_range': {
-                'start': None,
-                'end': None
+                'start': min(timestamps),
+                'end': max(timestamps)
             }
         }
-        
-        for email in self.emails:
-            # Gönderici istatistikleri
-            sender = email['from'].split('<')[0].strip() if '<' in email['from'] else email['from']
-            if sender not in stats['senders']:
-                stats['senders'][sender] = 0
-            stats['senders'][sender] += 1
-            
-            # Tarih aralığı
-            timestamp = email['timestamp']
-            if stats['date_range']['start'] is None or timestamp < stats['date_range']['start']:
-                stats['date_range']['start'] = timestamp
-            if stats['date_range']['end'] is None or timestamp > stats['date_range']['end']:
-                stats['date_range']['end'] = timestamp
-        
-        # Göndericileri email sayısına göre sırala
-        stats['senders'] = dict(
-            sorted(stats['senders'].items(), key=lambda x: x[1], reverse=True)[:10]
-        )
-        
-        return stats
     
     def save_to_json(self, output_path: str) -> bool:
         """
-        Email'leri JSON dosyasına kaydet
+        Email'leri JSON dosyasına kaydet (email email yazılır)
         
         Args:
             output_path: Çıktı dosyası yolu
@@ -413,8 +882,14 @@ class EmailParser:
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(self.emails, f, ensure_ascii=False, indent=2)
+            # Dizi elle çerçevelenir: serializer'da aynı anda tek email tutulur
+            with open(output_file, 'wb') as f:
+                f.write(b'[\n')
+                for i, email in enumerate(self.emails):
+                    if i:
+                        f.write(b',\n')
+                    f.write(_dumps(email))
+                f.write(b'\n]\n')
             
             logger.info(f"Email'ler kaydedildi: {output_path}")
             return True
@@ -422,3 +897,27 @@ class EmailParser:
         except Exception as e:
             logger.error(f"Kaydetme hatası: {e}")
             return False
+
+
+# Process başına, parser sınıfı başına tek (bağlantısız) instance
+_WORKER_PARSERS: Dict[type, EmailParser] = {}
+
+
+def _parse_raw_email(parser_cls: type, raw: bytes) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Ham email'i parse et (ProcessPoolExecutor worker'ı - modül seviyesinde, picklable)
+    
+    Args:
+        parser_cls: EmailParser (veya _is_spam'i override eden alt sınıfı)
+        raw: Ham email byte'ları
+    
+    Returns:
+        (parse edilmiş email, None) veya hata durumunda (None, hata mesajı)
+    """
+    parser = _WORKER_PARSERS.get(parser_cls)
+    if parser is None:
+        parser = _WORKER_PARSERS[parser_cls] = parser_cls("", "")
+    try:
+        return parser._parse_email_message(_PARSER.parsebytes(raw)), None
+    except Exception as e:
+        return None, str(e)
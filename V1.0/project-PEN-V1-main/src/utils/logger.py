@@ -2,12 +2,19 @@
 Loglama yardımcı fonksiyonları
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 
-def setup_logger(name: str, log_file: str = None, level: str = "INFO") -> logging.Logger:
+# Modüllerin get_logger(__name__) ile aldığı logger'ların ortak üst logger'ı
+PACKAGE_LOGGER = "src"
+
+def setup_logger(name: str, log_file: str = None, level: str = "INFO",
+                 use_queue: bool = True) -> logging.Logger:
     """
     Logger oluştur ve yapılandır
     
@@ -15,12 +22,22 @@ def setup_logger(name: str, log_file: str = None, level: str = "INFO") -> loggin
         name: Logger adı
         log_file: Log dosyası yolu (opsiyonel)
         level: Log seviyesi (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        use_queue: Kayıtları kuyruk üzerinden arka plan thread'ine yazdır
+            (paralel email worker'ları konsol/dosya I/O'sunu beklemez)
     
     Returns:
-        Yapılandırılmış logger
+        Yapılandırılmış logger (aynı isimle tekrar çağrılırsa handler eklenmez)
+    
+    Modül logger'ları (src.*) bu logger'ın altında olmadığından aynı handler
+    'src' logger'ına da eklenir (henüz yapılandırılmamışsa).
     """
     logger = logging.getLogger(name)
+    if getattr(logger, '_configured', False):
+        return logger
+    
     logger.setLevel(getattr(logging, level.upper()))
+    # Kayıtlar root logger'ın handler'larından ikinci kez geçmesin
+    logger.propagate = False
     
     # Formatter
     formatter = logging.Formatter(
@@ -31,7 +48,7 @@ def setup_logger(name: str, log_file: str = None, level: str = "INFO") -> loggin
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # File handler (opsiyonel)
     if log_file:
@@ -40,8 +57,30 @@ def setup_logger(name: str, log_file: str = None, level: str = "INFO") -> loggin
         
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if use_queue:
+        # Gerçek handler'lar tek bir listener thread'inde çalışır
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        # Çıkışta kuyrukta kalan kayıtlar yazılsın
+        atexit.register(listener.stop)
+        handlers = [QueueHandler(log_queue)]
+    
+    targets = [logger]
+    package_logger = logging.getLogger(PACKAGE_LOGGER)
+    if package_logger is not logger and not getattr(package_logger, '_configured', False):
+        package_logger.setLevel(logger.level)
+        package_logger.propagate = False
+        package_logger._configured = True
+        targets.append(package_logger)
+    
+    for target in targets:
+        for handler in handlers:
+            target.addHandler(handler)
     
+    logger._configured = True
     return logger
 
 def get_logger(name: str) -> logging.Logger: